@@ -0,0 +1,135 @@
+import ast
+import os
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from components import Component
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "registry.py")
+
+
+@dataclass
+class DuplicateKey:
+    """A dict literal key defined more than once; the last definition wins"""
+    key: str
+    lines: List[int]
+
+
+@dataclass
+class RegistryReport:
+    duplicates: List[DuplicateKey] = field(default_factory=list)
+    # Entry -> the earlier entry that matches every element it would match
+    shadowed: Dict[str, str] = field(default_factory=dict)
+    # Entry -> why no parsed element can ever match it
+    unreachable: Dict[str, str] = field(default_factory=dict)
+    # Entries that can win a match, grouped by tag in registry order
+    dispatch: Dict[str, Component] = field(default_factory=dict)
+
+    @property
+    def clean(self) -> bool:
+        return not (self.duplicates or self.shadowed or self.unreachable)
+
+
+def find_duplicate_keys(source: str) -> List[DuplicateKey]:
+    """Keys repeated within any dict literal of source; Python keeps only the last"""
+    duplicates = []
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.Dict):
+            continue
+        lines: Dict[str, List[int]] = {}
+        for key in node.keys:
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                lines.setdefault(key.value, []).append(key.lineno)
+        duplicates.extend(DuplicateKey(key, key_lines) for key, key_lines in lines.items() if len(key_lines) > 1)
+    return sorted(duplicates, key=lambda duplicate: duplicate.lines[0])
+
+
+def _data_attributes(component: Component) -> Dict[str, str]:
+    return {attr: str(value) for attr, value in component.match_pattern['data_attributes'].items()}
+
+
+def _signature_classes(component: Component) -> FrozenSet[str]:
+    # The registry writes some empty signatures as {}, a dict
+    return frozenset(component.match_pattern['signature_classes'])
+
+
+def unreachable_reason(component: Component) -> Optional[str]:
+    """Why component can never match parsed HTML, or None"""
+    # Every parser backend lower-cases tag and attribute names
+    if component.tag != component.tag.lower():
+        return f"tag {component.tag!r} is not lower case"
+    for attr in component.match_pattern['data_attributes']:
+        if attr != attr.lower():
+            return f"attribute {attr!r} is not lower case"
+    return None
+
+
+def shadows(earlier: Component, later: Component) -> bool:
+    """Whether earlier matches every element later matches, so later can never win"""
+    if earlier.tag != later.tag:
+        return False
+    if not _data_attributes(earlier).items() <= _data_attributes(later).items():
+        return False
+    return _signature_classes(earlier) <= _signature_classes(later)
+
+
+def analyze(components: Dict[str, Component], source: Optional[str] = None) -> RegistryReport:
+    """Check components for entries that cannot win a first-match lookup.
+
+    source is the registry's Python source, needed to find duplicate keys:
+    they are gone from the dict by the time it is built.
+    """
+    report = RegistryReport()
+    if source is not None:
+        report.duplicates = find_duplicate_keys(source)
+
+    reachable: Dict[str, List[Tuple[str, Component]]] = {}
+    for key, component in components.items():
+        reason = unreachable_reason(component)
+        if reason is not None:
+            report.unreachable[key] = reason
+            continue
+        same_tag = reachable.setdefault(component.tag, [])
+        winner = next((earlier_key for earlier_key, earlier in same_tag if shadows(earlier, component)), None)
+        if winner is not None:
+            report.shadowed[key] = winner
+            continue
+        same_tag.append((key, component))
+
+    # Only elements of the same tag compete, so grouping by tag keeps every match result
+    report.dispatch = {key: component for entries in reachable.values() for key, component in entries}
+    return report
+
+
+def dispatch_table(components: Dict[str, Component]) -> Dict[str, Component]:
+    """components without the entries that can never win a match"""
+    return analyze(components).dispatch
+
+
+def analyze_registry(path: str = REGISTRY_PATH) -> RegistryReport:
+    from registry import COMPONENTS
+
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    return analyze(COMPONENTS, source)
+
+
+def format_report(report: RegistryReport) -> str:
+    lines = []
+    for duplicate in report.duplicates:
+        at = ", ".join(str(line) for line in duplicate.lines)
+        lines.append(f"duplicate key {duplicate.key!r} on lines {at}; only line {duplicate.lines[-1]} is used")
+    for key, winner in report.shadowed.items():
+        lines.append(f"{key} is shadowed by {winner}, which matches first on every element {key} matches")
+    for key, reason in report.unreachable.items():
+        lines.append(f"{key} is unreachable: {reason}")
+    lines.append(f"{len(report.dispatch)} entries in the dispatch table")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+
+    registry_report = analyze_registry()
+    print(format_report(registry_report))
+    sys.exit(0 if registry_report.clean else 1)
@@ -0,0 +1,321 @@
+import gc
+import io
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from converter import ChildWalk, JSXConverter, StartNode
+from writer import JSXWriter
+
+DEFAULT_CHUNK_SIZE = 16
+# Chunks in flight per worker; bounds memory however long the input is
+PENDING_CHUNKS_PER_WORKER = 2
+
+
+@dataclass
+class ConversionResult:
+    """Outcome of one document of a batch: its JSX, or the error converting it"""
+    index: int
+    jsx: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# The converter each worker process uses: inherited when forked, else built by _init_worker
+_worker_converter: Optional[JSXConverter] = None
+# Held by a thread from setting the globals forked workers inherit until they are forked
+_fork_lock = threading.RLock()
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_options(converter: JSXConverter) -> Dict:
+    """Constructor arguments that rebuild converter in another process"""
+    options = {
+        "iterative": converter.iterative,
+        "parser": converter.parser,
+        "match_cache_size": converter.match_cache_size,
+        "profile": converter.profile,
+        "cache": converter.cache,
+        "memoize": converter.memoize,
+    }
+    if converter.catalog is not None:
+        options["catalog_directory"] = converter.catalog.directory
+    elif converter.components is not None and not converter.bundled:
+        options["components"] = converter.components
+    return options
+
+
+def build_converter(options: Dict) -> JSXConverter:
+    options = dict(options)
+    catalog_directory = options.pop("catalog_directory", None)
+    if catalog_directory is not None:
+        return JSXConverter.from_catalog(catalog_directory, **options)
+    return JSXConverter(**options)
+
+
+def _init_worker(options: Dict):
+    global _worker_converter
+    _worker_converter = build_converter(options).prepare()
+
+
+def _init_forked_worker():
+    # The parent disabled collection around the fork; objects it froze stay frozen here
+    gc.enable()
+
+
+def can_share_by_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def prepare_for_fork(converter: JSXConverter, warm_documents: Iterable[str] = ()) -> JSXConverter:
+    """Fully prepare converter, then move everything alive to the permanent generation.
+
+    Converting warm_documents fills the match and merge caches. Frozen objects
+    are never traversed by the collector, so forked workers don't write to
+    (and so copy) the pages holding the registry, indexes and caches.
+    """
+    converter.prepare()
+    for html in warm_documents:
+        converter.convert(html)
+    gc.collect()
+    gc.freeze()
+    return converter
+
+
+@contextmanager
+def worker_pool(converter: JSXConverter, workers: int, shared: bool = True,
+                warm_documents: Iterable[str] = ()) -> Iterator[ProcessPoolExecutor]:
+    """Process pool whose workers convert with converter.
+
+    With shared (and where fork is available) converter is prepared here and
+    frozen, and every worker is forked from this process and shares it copy on
+    write. Otherwise each worker rebuilds it from its constructor options.
+    """
+    global _worker_converter
+    if not (shared and can_share_by_fork()):
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(worker_options(converter),))
+        try:
+            yield executor
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return
+
+    with _fork_lock:
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            _worker_converter = prepare_for_fork(converter, warm_documents)
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                           initializer=_init_forked_worker)
+            try:
+                # Fork every worker now, while nothing has been allocated since the freeze
+                for future in [executor.submit(os.getpid) for _ in range(workers)]:
+                    future.result()
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+        finally:
+            # The workers have their copy; another pool may fork with its own now
+            _worker_converter = None
+            gc.unfreeze()
+            if gc_enabled:
+                gc.enable()
+    try:
+        yield executor
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def convert_chunk(converter: JSXConverter, chunk: List[Tuple[int, str]]) -> List[ConversionResult]:
+    results = []
+    for index, html in chunk:
+        try:
+            results.append(ConversionResult(index, jsx=converter.convert(html)))
+        except Exception as e:
+            results.append(ConversionResult(index, error=f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _convert_chunk_in_worker(chunk: List[Tuple[int, str]]) -> List[ConversionResult]:
+    return convert_chunk(_worker_converter, chunk)
+
+
+def convert_in_worker(html: str) -> ConversionResult:
+    """Convert one document in a worker_pool process; submit it to the pool's executor"""
+    return convert_chunk(_worker_converter, [(0, html)])[0]
+
+
+def _chunks(documents: Iterable[str], chunk_size: int) -> Iterator[List[Tuple[int, str]]]:
+    numbered = enumerate(documents)
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_many(converter: JSXConverter, documents: Iterable[str], workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_pending: Optional[int] = None,
+                 shared: bool = True, warm_documents: Iterable[str] = ()) -> Iterator[ConversionResult]:
+    """Convert documents in a process pool, yielding results in input order.
+
+    Workers are forked from this process after the converter is prepared and
+    frozen here (see worker_pool), or, without fork or with shared=False,
+    rebuild it once from its constructor options. Each task converts a chunk
+    of chunk_size documents. At most max_pending chunks are submitted ahead of
+    the one being yielded, so documents are read from the iterable only as
+    fast as results are consumed. workers=0 converts in this process.
+    """
+    if workers is None:
+        workers = available_cpus()
+    if workers <= 0:
+        for chunk in _chunks(documents, chunk_size):
+            yield from convert_chunk(converter, chunk)
+        return
+
+    max_pending = max_pending or workers * PENDING_CHUNKS_PER_WORKER
+    chunks = _chunks(documents, chunk_size)
+    pending: Deque[Future] = deque()
+    # Shut down on exit, also when the caller stops iterating early
+    with worker_pool(converter, workers, shared, warm_documents) as executor:
+        for chunk in islice(chunks, max_pending):
+            pending.append(executor.submit(_convert_chunk_in_worker, chunk))
+        while pending:
+            results = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(_convert_chunk_in_worker, chunk))
+            yield from results
+
+
+# Split mode: a document parsed in this process, cut into parts that forked workers render
+MIN_SPLIT_SIZE = 2000
+PARTS_PER_WORKER = 4
+
+# Runs of sibling nodes each worker task renders, inherited by forked workers
+_document_parts: List[List] = []
+_document_start: Optional[StartNode] = None
+
+
+def subtree_size(node) -> int:
+    """Nodes in the subtree of a BeautifulSoup or lxml node"""
+    if isinstance(node, str):
+        return 1
+    descendants = getattr(node, "descendants", None)
+    if descendants is not None:
+        return 1 + sum(1 for _ in descendants)
+    if isinstance(getattr(node, "tag", None), str):
+        # lxml counts elements only; text rides along with them
+        return sum(1 for _ in node.iter())
+    return 1
+
+
+def split_document(nodes: List, contents: Callable[[Any], List], target: int) -> Tuple[List[List], Dict]:
+    """Cut the tree under nodes into runs of siblings of about target nodes each.
+
+    Elements bigger than target aren't handed out whole: their own children
+    are cut in turn. Returns the runs, and for each of those big elements
+    (and None for the top level), its children as either a run number, or
+    None for a child that is itself cut. The element is kept with them, so
+    that the id keying the entry stays its own.
+    """
+    parts: List[List] = []
+    plan: Dict[int, Tuple[Any, List[Tuple[int, Optional[int]]]]] = {}
+    stack = [(None, nodes)]
+    while stack:
+        parent, children = stack.pop()
+        entries = []
+        run_start = run_size = 0
+        for position, child in enumerate(children + [None]):
+            size = 0 if child is None else subtree_size(child)
+            big = size > target and size > 1
+            if run_start < position and (child is None or big or run_size >= target):
+                entries.append((run_start, len(parts)))
+                parts.append(children[run_start:position])
+                run_start, run_size = position, 0
+            if big:
+                entries.append((position, None))
+                stack.append((child, contents(child)))
+                run_start = position + 1
+            else:
+                run_size += size
+        plan[id(parent)] = (parent, entries)
+    return parts, plan
+
+
+class _Part:
+    """Stands in for a run of siblings while the parent writes the rest"""
+    __slots__ = ("future",)
+
+    def __init__(self, future: Future):
+        self.future = future
+
+
+def _convert_part_in_worker(index: int) -> str:
+    from subtree import MARKER
+
+    buffer = io.StringIO()
+    _worker_converter._write_nodes(_document_parts[index], JSXWriter(buffer, base=MARKER), 0, _document_start)
+    return buffer.getvalue()
+
+
+def write_split(converter: JSXConverter, nodes: List, writer: JSXWriter, start: StartNode,
+                contents: Callable[[Any], List], workers: int):
+    """Write the parsed document nodes like converter._write_nodes, rendering parts in parallel.
+
+    Runs of siblings are rendered by workers forked from this process, so they
+    find the tree already in memory, with their indentation left as
+    subtree.MARKER. This process writes the elements enclosing them and
+    drops each result in at its place, indented there. Without fork, or for
+    a small document, nodes are written here as usual.
+    """
+    from subtree import MARKER
+
+    global _document_parts, _document_start
+    total = sum(subtree_size(node) for node in nodes)
+    if workers <= 1 or total < MIN_SPLIT_SIZE or not can_share_by_fork():
+        converter._write_nodes(nodes, writer, 0, start)
+        return
+
+    parts, plan = split_document(nodes, contents, max(total // (workers * PARTS_PER_WORKER), 1))
+    with ExitStack() as stack:
+        with _fork_lock:
+            _document_parts, _document_start = parts, start
+            try:
+                executor = stack.enter_context(worker_pool(converter, min(workers, len(parts))))
+            finally:
+                _document_parts, _document_start = [], None
+        futures = [executor.submit(_convert_part_in_worker, index) for index in range(len(parts))]
+
+        def place(children: List, parent) -> List:
+            return [children[position] if part is None else _Part(futures[part])
+                    for position, part in plan[id(parent)][1]]
+
+        def start_or_place(node, writer: JSXWriter, indent_level: int) -> Optional[ChildWalk]:
+            if isinstance(node, _Part):
+                jsx = node.future.result()
+                if jsx:
+                    writer.item(jsx.replace(MARKER, writer.indent(indent_level)))
+                return None
+            walk = start(node, writer, indent_level)
+            if walk:
+                children, child_indent, close = walk
+                return place(children, node), child_indent, close
+            return walk
+
+        converter._walk(place(nodes, None), writer, 0, start_or_place)
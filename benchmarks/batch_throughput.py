@@ -0,0 +1,44 @@
+"""Time convert_many against converting one document after another.
+
+    python benchmarks/batch_throughput.py [--documents N] [--workers N ...]
+
+Exits non-zero if the pool's results differ from serial conversion.
+"""
+import argparse
+import sys
+import time
+
+from corpus import sample_documents
+
+
+def main() -> int:
+    from batch import available_cpus
+    from converter import JSXConverter
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[available_cpus()])
+    parser.add_argument("--chunk-size", type=int, default=16)
+    args = parser.parse_args()
+
+    documents = sample_documents(args.documents)
+    converter = JSXConverter()
+    started = time.perf_counter()
+    reference = [converter.convert(html) for html in documents]
+    serial = time.perf_counter() - started
+    print(f"serial     {serial * 1000:8.1f} ms for {len(documents)} documents")
+
+    failed = False
+    for workers in args.workers:
+        started = time.perf_counter()
+        results = list(converter.convert_many(documents, workers=workers, chunk_size=args.chunk_size))
+        elapsed = time.perf_counter() - started
+        print(f"{workers:2} workers {elapsed * 1000:8.1f} ms  {serial / elapsed:4.1f}x")
+        if [result.jsx for result in results] != reference:
+            failed = True
+            print(f"{workers} workers: results differ from serial conversion")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Check that a catalog exported from the registry converts like the registry.
+
+    python benchmarks/catalog_conformance.py [--documents N]
+
+Exports registry.COMPONENTS to a temporary catalog, converts the corpus with
+both, and reports how many families each document needed. Exits non-zero if
+any output differs.
+"""
+import argparse
+import sys
+import tempfile
+import time
+
+from corpus import sample_documents
+
+
+def main() -> int:
+    from catalog import Catalog, export_catalog
+    from converter import JSXConverter
+    from registry import COMPONENTS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    args = parser.parse_args()
+
+    documents = sample_documents(args.documents)
+    reference = JSXConverter(COMPONENTS)
+    with tempfile.TemporaryDirectory() as directory:
+        families = export_catalog(COMPONENTS, directory)
+        converter = JSXConverter.from_catalog(directory)
+        mismatches = []
+        needed = 0
+        started = time.perf_counter()
+        for i, html in enumerate(documents):
+            if converter.convert(html) != reference.convert(html):
+                mismatches.append(i)
+            needed += len(converter.catalog.families_for_document(html))
+        elapsed = time.perf_counter() - started
+
+        print(f"{len(families)} families, {needed / len(documents):.1f} needed per document on average")
+        print(f"main.py page needs: {', '.join(sorted(Catalog(directory).families_for_document(documents[0])))}")
+        print(f"{elapsed * 1000:.1f} ms for {len(documents)} documents, both converters")
+        if mismatches:
+            print(f"{len(mismatches)} documents differ, first is #{mismatches[0]}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
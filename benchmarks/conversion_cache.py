@@ -0,0 +1,45 @@
+"""Time conversion through a cold and a warm on-disk cache.
+
+    python benchmarks/conversion_cache.py [--documents N] [--max-mib N]
+
+Converts the corpus twice through a fresh ConversionCache in a temporary
+directory. Exits non-zero if any cached output differs from a direct
+conversion.
+"""
+import argparse
+import sys
+import tempfile
+import time
+
+from corpus import sample_documents
+
+
+def main() -> int:
+    from cache import ConversionCache
+    from converter import JSXConverter
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--max-mib", type=int, default=256)
+    args = parser.parse_args()
+
+    documents = sample_documents(args.documents)
+    reference = [JSXConverter().convert(html) for html in documents]
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ConversionCache(directory, max_bytes=args.max_mib * 1024 * 1024)
+        converter = JSXConverter(cache=cache)
+        for run in ("cold", "warm"):
+            started = time.perf_counter()
+            outputs = [converter.convert(html) for html in documents]
+            elapsed = time.perf_counter() - started
+            print(f"{run}  {elapsed * 1000:8.1f} ms for {len(documents)} documents  {cache.stats()}")
+            if outputs != reference:
+                failed = True
+                print(f"{run}: cached output differs from direct conversion")
+        cache.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
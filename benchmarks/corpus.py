@@ -0,0 +1,167 @@
+"""Synthetic shadcn pages for the benchmarks.
+
+Pages are built from the registry itself: every component is emitted with its
+tag, data attributes, signature and style classes and a random variant, mixed
+with plain markup. Nesting follows the HTML content model so every parser
+backend builds the same tree.
+"""
+import os
+import random
+import re
+import sys
+from html import escape
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+VOID_TAGS = {"img", "input", "br", "hr"}
+# Tags that may only contain phrasing content, and the tags allowed inside them
+PHRASING_TAGS = {"span", "a", "button", "label", "p", "h2"}
+PHRASING_CONTENT = {"span", "svg", "img", "input", "br"}
+PLAIN_CLASSES = ["flex", "grid", "gap-2", "p-4", "px-2", "mt-1", "text-sm", "text-muted-foreground", "w-full"]
+TEXTS = ["Dashboard", "Settings", "Sign in", "  ", "Acme &amp; Co", "Read more"]
+# Written without a value; libxml2 fills in the first three as name="name"
+VALUELESS_ATTRIBUTES = ["disabled", "checked", "selected", "open", "hidden", "data-active"]
+
+_START_TAG_RE = re.compile(r"<[a-z][a-z0-9-]*(?=[\s>])")
+
+
+def page_html() -> str:
+    """The header from main.py, a real exported shadcn page"""
+    from main import html_input
+    return html_input
+
+
+def _attrs(classes, attributes) -> str:
+    out = ""
+    if classes:
+        out += f' class="{escape(" ".join(classes))}"'
+    for name, value in attributes.items():
+        out += f" {name}" if value is None else f' {name}="{escape(str(value))}"'
+    return out
+
+
+class PageBuilder:
+    def __init__(self, seed: int, profile: str = "all"):
+        from profiles import select_components
+        from registry import COMPONENTS
+        self.rnd = random.Random(seed)
+        # Components with a data-slot or with signature classes are recognisable
+        self.components = [
+            c for c in select_components(COMPONENTS, profile).values()
+            if c.tag not in ("Slot", "form", "li") and (
+                c.match_pattern['signature_classes'] or c.match_pattern['data_attributes']
+            )
+        ]
+
+    def component(self, depth: int, phrasing: bool) -> str:
+        rnd = self.rnd
+        choices = [c for c in self.components if not phrasing or c.tag in PHRASING_CONTENT]
+        component = rnd.choice(choices)
+        pattern = component.match_pattern
+        classes = list(pattern['signature_classes'])
+        classes += [c for c in pattern['style_classes'] if rnd.random() < 0.8]
+        for variants in pattern['variant_patterns'].values():
+            classes += sorted(rnd.choice(list(variants.values())))
+        if rnd.random() < 0.3:
+            classes.append(rnd.choice(PLAIN_CLASSES))
+        rnd.shuffle(classes)
+        attributes = dict(pattern['data_attributes'])
+        if rnd.random() < 0.3:
+            attributes["data-state"] = rnd.choice(["open", "closed"])
+        if rnd.random() < 0.15:
+            attributes[rnd.choice(VALUELESS_ATTRIBUTES)] = None
+        return self.element(component.tag, classes, attributes, depth)
+
+    def plain(self, depth: int, phrasing: bool) -> str:
+        tag = self.rnd.choice(["span"] if phrasing else ["div", "section", "span", "a", "ul"])
+        classes = self.rnd.sample(PLAIN_CLASSES, self.rnd.randint(0, 3))
+        return self.element(tag, classes, {}, depth)
+
+    def element(self, tag: str, classes, attributes, depth: int) -> str:
+        if tag in VOID_TAGS:
+            return f"<{tag}{_attrs(classes, attributes)}>"
+        if tag == "svg":
+            return f'<svg{_attrs(classes, attributes)}><path d="M12 2v2"></path></svg>'
+        phrasing = tag in PHRASING_TAGS
+        if tag == "ul":
+            children = "".join(f"<li>{self.children(depth + 1, False)}</li>" for _ in range(self.rnd.randint(1, 3)))
+        else:
+            children = self.children(depth + 1, phrasing)
+        return f"<{tag}{_attrs(classes, attributes)}>{children}</{tag}>"
+
+    def children(self, depth: int, phrasing: bool) -> str:
+        rnd = self.rnd
+        if depth > 6:
+            return rnd.choice(TEXTS)
+        out = []
+        for _ in range(rnd.randint(1, 4)):
+            roll = rnd.random()
+            if roll < 0.2:
+                out.append(rnd.choice(TEXTS))
+            elif roll < 0.7:
+                out.append(self.component(depth, phrasing))
+            else:
+                out.append(self.plain(depth, phrasing))
+        return "".join(out)
+
+
+def sample_documents(count: int = 50, seed: int = 0) -> List[str]:
+    """The main.py page followed by count synthetic pages"""
+    builder = PageBuilder(seed)
+    return [page_html()] + [builder.children(0, False) for _ in range(count)]
+
+
+def profile_documents(profile: str, count: int = 50, seed: int = 0) -> List[str]:
+    """count synthetic pages using only the components of one registry profile"""
+    builder = PageBuilder(seed, profile)
+    return [builder.children(0, False) for _ in range(count)]
+
+
+def grid_documents(count: int = 20, cells: int = 200, designs: int = 5, seed: int = 0) -> List[str]:
+    """count pages that each repeat a few card designs over a grid of cells"""
+    builder = PageBuilder(seed)
+    pages = []
+    for _ in range(count):
+        cards = [builder.component(3, False) for _ in range(designs)]
+        grid = "".join(builder.rnd.choice(cards) for _ in range(cells))
+        pages.append(f'<section class="grid gap-4 p-4">{grid}</section>')
+    return pages
+
+
+# Full pages that open at <head> or <body> rather than <html>
+DOCUMENT_SHELLS = [
+    '<!DOCTYPE html><head><meta charset="utf-8"><title>Acme</title></head><body class="min-h-screen bg-background">{}</body>',
+    '<body class="min-h-screen antialiased"><main class="flex-1">{}</main></body>',
+    '<!-- exported -->\n<head>\n<meta name="viewport" content="width=device-width">\n</head>\n<body>\n{}\n</body>\n',
+    '<head><title>Acme</title></head>\n{}',
+]
+
+
+def document_shell_documents(count: int = 50, seed: int = 0) -> List[str]:
+    """count synthetic pages, each inside one of DOCUMENT_SHELLS"""
+    builder = PageBuilder(seed)
+    return [DOCUMENT_SHELLS[i % len(DOCUMENT_SHELLS)].format(builder.children(0, False)) for i in range(count)]
+
+
+def duplicate_attribute_documents(count: int = 50, seed: int = 0) -> List[Tuple[str, str]]:
+    """count synthetic pages that write an attribute twice on some start tags.
+
+    Each comes paired with the same page keeping only the first value, which
+    is how lxml reads it; BeautifulSoup keeps the last.
+    """
+    builder = PageBuilder(seed)
+    rnd = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        html = builder.children(0, False)
+        duplicated, first_only, position = [], [], 0
+        for match in _START_TAG_RE.finditer(html):
+            if rnd.random() < 0.2:
+                duplicated += [html[position:match.end()], ' title="first" title="second"']
+                first_only += [html[position:match.end()], ' title="first"']
+                position = match.end()
+        pairs.append(("".join(duplicated) + html[position:], "".join(first_only) + html[position:]))
+    return pairs
@@ -0,0 +1,86 @@
+"""Measure the converter's cold start and check it stays within budget.
+
+    python benchmarks/import_time.py [--budget-ms N] [--runs N]
+
+Each run is a fresh interpreter under ``-X importtime``; every stage is timed
+from the first line of the script, so lazy imports are counted where they
+happen. Exits non-zero if ``import converter`` takes longer than the budget
+(median of the runs), or if importing it or constructing a JSXConverter loads a
+module that should wait for the first conversion, or never be needed by it.
+
+The budget is the whole import, at the speed of the machine it was set on.
+Before its stage, each run times a fixed pure Python loop, and the budget is
+scaled by how long that took against CALIBRATION_MS, so a machine that is
+slower (or slowed down by other work for a while) doesn't fail the check.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use only: parsing, merging and the registry itself, and
+# costly standard library modules that only some options or entry points need
+DEFERRED_MODULES = ("bs4", "lxml", "tailwind_merge", "registry", "snapshot",
+                    "hashlib", "_hashlib", "ssl", "json", "asyncio", "multiprocessing")
+
+STAGES = {
+    "import": "import converter",
+    "construct": "import converter; converter.JSXConverter()",
+    "first convert": "import converter; converter.JSXConverter().convert('<div class=\"p-4\">x</div>')",
+}
+
+# Milliseconds CALIBRATION took on the machine --budget-ms is set for
+CALIBRATION_MS = 35.0
+CALIBRATION = "_x = 0\nfor _i in range(300000):\n    _x += _i * 2 % 7"
+
+TIMED = ("import time as _t; _c = _t.perf_counter()\n" + CALIBRATION + "\n_s = _t.perf_counter()\n{}\n"
+         "print((_s - _c) * 1000, (_t.perf_counter() - _s) * 1000)")
+
+
+def import_profile(code: str):
+    """Milliseconds taken by code, relative speed of this run, and the top-level names of the modules code imported"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", TIMED.format(code)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            modules.add(name.split(".")[0])
+    calibration_ms, total_ms = map(float, result.stdout.split()[-2:])
+    return total_ms, calibration_ms / CALIBRATION_MS, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=42.0)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    failed = False
+    for stage, code in STAGES.items():
+        profiles = [import_profile(code) for _ in range(args.runs)]
+        # The median run, once its time is scaled to its speed
+        profiles.sort(key=lambda profile: profile[0] / profile[1])
+        total_ms, slowdown, modules = profiles[len(profiles) // 2]
+        budget_ms = args.budget_ms * slowdown
+        loaded = [name for name in DEFERRED_MODULES if name in modules]
+        print(f"{stage:14} {total_ms:8.1f} ms  ({total_ms / slowdown:5.1f} ms at calibrated speed)  "
+              f"deferred modules loaded: {', '.join(loaded) or 'none'}")
+
+        if stage == "first convert":
+            continue
+        if loaded:
+            failed = True
+            print(f"{stage}: loads {', '.join(loaded)} before the first conversion")
+        if stage == "import" and total_ms > budget_ms:
+            failed = True
+            print(f"import converter took {total_ms:.1f} ms, budget is {budget_ms:.1f} ms at this run's speed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
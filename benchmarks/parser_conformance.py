@@ -0,0 +1,58 @@
+"""Check that every parser backend produces the same JSX, and time them.
+
+    python benchmarks/parser_conformance.py [--documents N]
+
+Exits non-zero if a backend's output differs from html.parser's, on the
+sample corpus and on pages that open at <head> or <body>. Pages that
+write an attribute twice are checked separately: lxml keeps the first value
+where html.parser keeps the last, so lxml's output for them must match
+html.parser's for the page keeping only the first.
+"""
+import argparse
+import sys
+import time
+
+from corpus import document_shell_documents, duplicate_attribute_documents, sample_documents
+
+
+def main() -> int:
+    from converter import JSXConverter
+    from registry import COMPONENTS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--backends", nargs="+", default=["html.parser", "lxml"])
+    args = parser.parse_args()
+
+    documents = sample_documents(args.documents) + document_shell_documents(args.documents // 4 or 1)
+    reference = None
+    failed = False
+    for backend in args.backends:
+        converter = JSXConverter(COMPONENTS, parser=backend)
+        started = time.perf_counter()
+        outputs = [converter.convert(html) for html in documents]
+        elapsed = time.perf_counter() - started
+        print(f"{backend:12} {elapsed * 1000:8.1f} ms for {len(documents)} documents")
+
+        if reference is None:
+            reference = outputs
+            continue
+        mismatches = [i for i, (a, b) in enumerate(zip(reference, outputs)) if a != b]
+        if mismatches:
+            failed = True
+            print(f"{backend}: {len(mismatches)} documents differ, first is #{mismatches[0]}")
+
+    if "lxml" in args.backends:
+        pairs = duplicate_attribute_documents(args.documents // 4 or 1)
+        lxml_converter = JSXConverter(COMPONENTS, parser="lxml")
+        reference_converter = JSXConverter(COMPONENTS)
+        mismatches = [i for i, (duplicated, first_only) in enumerate(pairs)
+                      if lxml_converter.convert(duplicated) != reference_converter.convert(first_only)]
+        if mismatches:
+            failed = True
+            print(f"duplicate attributes: {len(mismatches)} documents differ, first is #{mismatches[0]}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Compare registry profiles on single-generation pages.
+
+    python benchmarks/profile_selection.py [--documents N]
+
+For v4-only and legacy-only pages, reports the candidates tested per element
+and the conversion time under "all" and under the page's own profile. Exits
+non-zero if narrowing to that profile changes the output.
+"""
+import argparse
+import sys
+import time
+
+from corpus import profile_documents
+
+
+def candidate_count(converter, documents) -> float:
+    """Average number of components tested per element"""
+    from bs4 import BeautifulSoup
+
+    index = converter.prepare().index
+    elements = candidates = 0
+    for html in documents:
+        for el in BeautifulSoup(html, "html.parser").find_all(True):
+            classes = set(el.get("class", ()))
+            candidates += len(index.candidates(el.name, classes, el.get("data-slot")))
+            elements += 1
+    return candidates / max(elements, 1)
+
+
+def main() -> int:
+    from converter import JSXConverter
+    from registry import COMPONENTS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100)
+    args = parser.parse_args()
+
+    failed = False
+    for page_profile in ("v4", "legacy"):
+        documents = profile_documents(page_profile, args.documents)
+        reference = None
+        print(f"{page_profile} pages")
+        for profile in ("all", page_profile):
+            converter = JSXConverter(COMPONENTS, profile=profile).prepare()
+            started = time.perf_counter()
+            outputs = [converter.convert(html) for html in documents]
+            elapsed = time.perf_counter() - started
+            print(f"  {profile:8} {elapsed * 1000:8.1f} ms  {candidate_count(converter, documents):5.2f} candidates per element")
+
+            if reference is None:
+                reference = outputs
+                continue
+            mismatches = [i for i, (a, b) in enumerate(zip(reference, outputs)) if a != b]
+            if mismatches:
+                failed = True
+                print(f"  {profile}: {len(mismatches)} documents differ from all, first is #{mismatches[0]}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Exercise the conversion service over local TCP: throughput, backpressure, deadlines, hang-ups.
+
+    python benchmarks/service_load.py [--documents N] [--workers N] [--concurrency N]
+
+Starts service.py's server in this process on a free port and talks HTTP to
+it, so nothing outside this machine is needed. Exits non-zero if any response
+differs from a direct conversion or a limit isn't enforced.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import ExitStack
+from typing import Tuple
+
+from corpus import sample_documents
+
+
+async def request(port: int, method: str, target: str, body: bytes = b"") -> Tuple[int, str]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload.decode("utf-8")
+
+
+async def hang_up(port: int, body: bytes):
+    """Send a conversion request and close the connection without waiting"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"POST /convert HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    writer.close()
+
+
+async def run(args) -> bool:
+    from converter import JSXConverter
+    from service import ConversionService, open_pool, start_service
+
+    documents = sample_documents(args.documents)
+    converter = JSXConverter()
+    expected = [converter.convert(html) for html in documents]
+    big = "".join(documents).encode()
+    ok = True
+    with ExitStack() as stack:
+        executor = open_pool(stack, converter, args.workers)
+        service = ConversionService(executor, args.workers, max_queue=len(documents))
+        server = await start_service(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            limit = asyncio.Semaphore(args.concurrency)
+
+            async def convert(html: str) -> Tuple[int, str]:
+                async with limit:
+                    return await request(port, "POST", "/convert", html.encode())
+
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(convert(html) for html in documents))
+            elapsed = time.perf_counter() - started
+            wrong = sum(response != (200, jsx) for response, jsx in zip(responses, expected))
+            print(f"throughput  {len(documents) / elapsed:7.1f} documents/s at concurrency {args.concurrency}, "
+                  f"{wrong} wrong")
+            ok &= wrong == 0
+
+            # A queue of one: a burst gets one conversion per worker, one waiting, and 503s
+            tight = ConversionService(executor, args.workers, max_queue=1)
+            tight_server = await start_service(tight, port=0)
+            tight_port = tight_server.sockets[0].getsockname()[1]
+            async with tight_server:
+                burst = await asyncio.gather(*(request(tight_port, "POST", "/convert", big)
+                                               for _ in range(args.workers + 6)))
+            statuses = sorted(status for status, _ in burst)
+            print(f"burst       statuses {statuses}")
+            ok &= statuses.count(503) >= 1 and statuses.count(200) >= args.workers
+
+            status, _ = await request(port, "POST", "/convert?timeout=0.0001", big)
+            print(f"deadline    status {status}")
+            ok &= status == 504
+
+            await asyncio.gather(*(hang_up(port, big) for _ in range(args.workers + 2)))
+            # Let the service notice; queued conversions are withdrawn, running ones run out
+            while service.stats.running or service.stats.queued:
+                await asyncio.sleep(0.05)
+            status, health = await request(port, "GET", "/health")
+            print(f"health      {health.strip()}")
+            ok &= status == 200 and service.stats.cancelled >= 1
+
+            status, _ = await request(port, "GET", "/convert")
+            ok &= status == 405
+    return ok
+
+
+def main() -> int:
+    from batch import available_cpus
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=max(available_cpus(), 2))
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    return 0 if asyncio.run(run(args)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Time one very large page converted sequentially and split across workers.
+
+    python benchmarks/split_document.py [--pages N] [--workers N ...]
+
+The page concatenates N synthetic pages under one <body>. Parsing stays
+sequential, so the speedup is bounded by the share of time spent rendering.
+Exits non-zero if a split conversion differs from the sequential one.
+"""
+import argparse
+import sys
+import time
+
+from corpus import sample_documents
+
+
+def main() -> int:
+    from batch import available_cpus
+    from converter import JSXConverter
+    from parsers import LXML_PARSER
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=150)
+    parser.add_argument("--workers", type=int, nargs="*", default=[2, 4])
+    args = parser.parse_args()
+
+    html = "<!DOCTYPE html><html><body>" + "".join(sample_documents(args.pages)[1:]) + "</body></html>"
+    print(f"{len(html) / 1e6:.1f} MB page, {available_cpus()} CPUs available")
+    failed = False
+    for backend in (LXML_PARSER, "html.parser"):
+        converter = JSXConverter(parser=backend)
+        converter.prepare()
+        started = time.perf_counter()
+        reference = converter.convert(html)
+        print(f"{backend:12} sequential   {(time.perf_counter() - started) * 1000:8.1f} ms")
+        for workers in args.workers:
+            started = time.perf_counter()
+            jsx = converter.convert(html, workers=workers)
+            print(f"{backend:12} {workers:2} workers   {(time.perf_counter() - started) * 1000:8.1f} ms")
+            if jsx != reference:
+                failed = True
+                print(f"{backend} with {workers} workers: output differs from sequential")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Time repetitive grid pages with and without subtree memoization.
+
+    python benchmarks/subtree_memo.py [--documents N] [--cells N] [--designs N] [--repeat N]
+
+Every page repeats a few card designs across its grid, the case memoize is
+for; the ordinary corpus shows its overhead elsewhere. Exits non-zero if
+memoized output differs from the plain walk.
+"""
+import argparse
+import sys
+import time
+
+from corpus import grid_documents, sample_documents
+
+# Loads the registry and parser before timing starts
+WARM_UP = '<div class="flex"><p>Ready</p></div>'
+
+
+def main() -> int:
+    from converter import JSXConverter
+    from parsers import LXML_PARSER
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--cells", type=int, default=200)
+    parser.add_argument("--designs", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="report the best of this many runs")
+    args = parser.parse_args()
+
+    corpora = {
+        "grid": grid_documents(args.documents, args.cells, args.designs),
+        "corpus": sample_documents(args.documents),
+    }
+    failed = False
+    for name, documents in corpora.items():
+        for backend in (LXML_PARSER, "html.parser"):
+            outputs = {}
+            for memoize in (False, True):
+                best = float("inf")
+                for _ in range(args.repeat):
+                    # Fresh each run, so no run reuses templates from the one before
+                    converter = JSXConverter(parser=backend, memoize=memoize)
+                    converter.convert(WARM_UP)
+                    started = time.perf_counter()
+                    outputs[memoize] = [converter.convert(html) for html in documents]
+                    best = min(best, time.perf_counter() - started)
+                print(f"{name:7} {backend:12} memoize={memoize!s:5} {best * 1000:8.1f} ms")
+            if outputs[True] != outputs[False]:
+                failed = True
+                print(f"{name} {backend}: memoized output differs")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Convert from many threads through one shared converter and check every result.
+
+    python benchmarks/thread_stress.py [--threads N] [--documents N] [--rounds N]
+
+Each configuration gets a converter that has not been prepared yet, so the
+threads also race to load the registry and catalog families. Every thread
+converts the corpus in its own shuffled order, and each result is compared
+with a serial conversion by a separate converter. Small caches keep entries
+being evicted while other threads read them. Meant for a
+free-threaded build (python3.13t), where the threads really run at once; under
+the GIL the switch interval is shortened to interleave them as often as it
+can. Exits non-zero on any mismatch or exception.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List
+
+from corpus import grid_documents, sample_documents
+
+
+def stress(make: Callable, documents: List[str], expected: List[str], threads: int, rounds: int) -> Dict:
+    converter = make()
+    barrier = threading.Barrier(threads)
+    mismatches: List[int] = []
+    errors: List[str] = []
+
+    def run(seed: int):
+        order = list(range(len(documents))) * rounds
+        random.Random(seed).shuffle(order)
+        barrier.wait()
+        for i in order:
+            try:
+                if converter.convert(documents[i]) != expected[i]:
+                    mismatches.append(i)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    workers = [threading.Thread(target=run, args=(seed,)) for seed in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    return {"mismatches": mismatches, "errors": errors,
+            "rate": threads * rounds * len(documents) / elapsed}
+
+
+def main() -> int:
+    from catalog import export_catalog
+    from converter import JSXConverter
+    from lru import gil_enabled
+    from parsers import LXML_PARSER
+    from registry import COMPONENTS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--documents", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=3, help="times each thread converts the corpus")
+    args = parser.parse_args()
+
+    if gil_enabled():
+        sys.setswitchinterval(1e-6)
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}, "
+          f"{args.threads} threads")
+
+    documents = sample_documents(args.documents) + grid_documents(args.documents // 5 or 1, cells=40)
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        export_catalog(COMPONENTS, directory)
+        configurations = {}
+        for backend in (LXML_PARSER, "html.parser"):
+            for memoize in (False, True):
+                configurations[f"{backend} memoize={memoize}"] = dict(parser=backend, memoize=memoize)
+        configurations["html.parser v4"] = dict(profile="v4")
+        configurations["lxml small caches"] = dict(parser=LXML_PARSER, match_cache_size=16)
+        configurations["html.parser iterative"] = dict(iterative=True)
+
+        makers = {name: (lambda options=options: JSXConverter(COMPONENTS, **options))
+                  for name, options in configurations.items()}
+        makers["lxml catalog"] = lambda: JSXConverter.from_catalog(directory, parser=LXML_PARSER)
+
+        for name, make in makers.items():
+            reference = make()
+            expected = [reference.convert(html) for html in documents]
+            result = stress(make, documents, expected, args.threads, args.rounds)
+            status = "ok"
+            if result["mismatches"] or result["errors"]:
+                failed = True
+                status = f"{len(result['mismatches'])} wrong, {len(result['errors'])} raised"
+                for error in sorted(set(result["errors"]))[:3]:
+                    print(f"    {error}")
+            print(f"{name:24} {result['rate']:8.1f} documents/s  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Measure the memory each convert_many worker adds, with and without sharing.
+
+    python benchmarks/worker_memory.py [--workers N] [--documents N]
+
+"rebuild" workers each build the converter from its options; "shared"
+workers are forked after the parent prepared and froze it. Every mode runs
+in a fresh interpreter. Reported per worker, from /proc/PID/smaps_rollup
+after the batch: RSS, PSS (shared pages split between the processes using
+them) and USS (pages only that worker holds), which is what each extra
+worker really costs. Linux only.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+
+from corpus import sample_documents
+
+MODES = ("rebuild", "shared")
+
+
+def memory_kib(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def measure(mode: str, workers: int, documents: int) -> dict:
+    from batch import _convert_chunk_in_worker, worker_pool
+    from converter import JSXConverter
+
+    docs = sample_documents(documents)
+    converter = JSXConverter()
+    with worker_pool(converter, workers, shared=mode == "shared", warm_documents=docs[:1]) as executor:
+        chunks = [list(enumerate(docs))[i:i + 16] for i in range(0, len(docs), 16)]
+        for future in [executor.submit(_convert_chunk_in_worker, chunk) for chunk in chunks]:
+            future.result()
+        usage = [memory_kib(process.pid) for process in multiprocessing.active_children()]
+    return {key: sum(u[key] for u in usage) / len(usage) for key in ("rss", "pss", "uss")}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.workers, args.documents)))
+        return 0
+
+    print(f"{args.workers} workers, {args.documents + 1} documents; KiB per worker")
+    print(f"{'':8} {'RSS':>8} {'PSS':>8} {'USS':>8}")
+    for mode in MODES:
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode,
+             "--workers", str(args.workers), "--documents", str(args.documents)],
+            capture_output=True, text=True, check=True,
+        )
+        usage = json.loads(result.stdout.splitlines()[-1])
+        print(f"{mode:8} {usage['rss']:8.0f} {usage['pss']:8.0f} {usage['uss']:8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Content-addressed on-disk cache of conversion results.
+
+    DIRECTORY/
+      index.bin          memory-mapped hash table: entry key -> size, last use
+      objects/ab/...     one file of JSX per entry, named by its key
+      lock               flock()ed around index updates
+
+Keys digest the converter fingerprint together with the input HTML, so a
+change to the registry, the converter or its options simply stops matching
+old entries, which then age out. Object files are written to a temporary
+name and renamed into place, and the index is only changed under the lock,
+so any number of processes can share a cache. Lookups take no lock: the
+index only says where to look, and the object file is the source of truth.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no flock(); one process per cache there
+    fcntl = None
+
+if TYPE_CHECKING:
+    from converter import JSXConverter
+
+INDEX_MAGIC = b"JSXCACHE"
+INDEX_VERSION = 1
+# magic, version, slot count, live entries, unused, total bytes of live entries
+HEADER = struct.Struct("<8sIIIIQ")
+# key, JSX size in bytes, last use (unix seconds)
+SLOT = struct.Struct("<16sII")
+KEY_SIZE = 16
+EMPTY_KEY = bytes(KEY_SIZE)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_SLOTS = 1 << 16
+# Keep the table sparse enough for short probe runs
+MAX_LOAD = 0.7
+# Eviction frees space down to this fraction of the limits
+EVICT_TO = 0.9
+
+
+class ConversionCache:
+    """Size-bounded cache of converter output, shared between processes"""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, slots: int = DEFAULT_SLOTS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.slots = slots
+        self.hits = 0
+        self.misses = 0
+        self._map: Optional[mmap.mmap] = None
+        # Threads each flock() through their own descriptor; this only guards mapping the index
+        self._map_lock = threading.Lock()
+
+    def __getstate__(self):
+        # The mapping belongs to this process; workers map the index themselves
+        return {"directory": self.directory, "max_bytes": self.max_bytes, "slots": self.slots}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, "index.bin")
+
+    def _object_path(self, key: bytes) -> str:
+        name = key.hex()
+        return os.path.join(self.directory, "objects", name[:2], name[2:])
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # A fresh descriptor each time: a forked child sharing ours would share the lock too
+        with open(os.path.join(self.directory, "lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _index(self) -> mmap.mmap:
+        if self._map is None:
+            with self._map_lock:
+                if self._map is None:
+                    self._map = self._open_index()
+        return self._map
+
+    def _open_index(self) -> mmap.mmap:
+        os.makedirs(self.directory, exist_ok=True)
+        with self._locked():
+            if not self._valid_index():
+                with open(self.index_path + ".tmp", "wb") as f:
+                    f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.slots, 0, 0, 0))
+                    f.truncate(HEADER.size + SLOT.size * self.slots)
+                os.replace(self.index_path + ".tmp", self.index_path)
+        with open(self.index_path, "r+b") as f:
+            index = mmap.mmap(f.fileno(), 0)
+        self.slots = HEADER.unpack_from(index)[2]
+        return index
+
+    def _valid_index(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(HEADER.size)
+                f.seek(0, os.SEEK_END)
+                actual = f.tell()
+        except OSError:
+            return False
+        if len(header) < HEADER.size:
+            return False
+        magic, version, slots, _, _, _ = HEADER.unpack(header)
+        return magic == INDEX_MAGIC and version == INDEX_VERSION and actual == HEADER.size + SLOT.size * slots
+
+    @staticmethod
+    def key(fingerprint: str, html: str) -> bytes:
+        digest = hashlib.blake2b(digest_size=KEY_SIZE)
+        digest.update(fingerprint.encode())
+        digest.update(b"\0")
+        digest.update(html.encode("utf-8", "surrogatepass"))
+        return digest.digest()
+
+    def _find(self, index: mmap.mmap, key: bytes) -> Tuple[int, bool]:
+        """Slot holding key, or the empty slot where it would go"""
+        start = int.from_bytes(key[:8], "little") % self.slots
+        for probe in range(self.slots):
+            slot = (start + probe) % self.slots
+            offset = HEADER.size + slot * SLOT.size
+            slot_key = index[offset:offset + KEY_SIZE]
+            if slot_key == key:
+                return slot, True
+            if slot_key == EMPTY_KEY:
+                return slot, False
+        return -1, False
+
+    def get(self, key: bytes) -> Optional[str]:
+        index = self._index()
+        slot, found = self._find(index, key)
+        if not found:
+            self.misses += 1
+            return None
+        try:
+            with open(self._object_path(key), "rb") as f:
+                jsx = f.read().decode("utf-8", "surrogatepass")
+        except OSError:
+            # Evicted by another process since the lookup
+            self.misses += 1
+            return None
+        # Unlocked: a lost update only makes the entry look older than it is
+        offset = HEADER.size + slot * SLOT.size + KEY_SIZE + 4
+        struct.pack_into("<I", index, offset, int(time.time()))
+        self.hits += 1
+        return jsx
+
+    def put(self, key: bytes, jsx: str):
+        data = jsx.encode("utf-8", "surrogatepass")
+        if len(data) > self.max_bytes * EVICT_TO:
+            return
+        path = self._object_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        index = self._index()
+        with self._locked():
+            slot, found = self._find(index, key)
+            if found:
+                return
+            _, _, slots, count, _, total = HEADER.unpack_from(index)
+            if slot < 0 or count + 1 > slots * MAX_LOAD or total + len(data) > self.max_bytes:
+                self._evict(index, len(data))
+                slot, _ = self._find(index, key)
+                _, _, slots, count, _, total = HEADER.unpack_from(index)
+            SLOT.pack_into(index, HEADER.size + slot * SLOT.size, key, len(data), int(time.time()))
+            HEADER.pack_into(index, 0, INDEX_MAGIC, INDEX_VERSION, slots, count + 1, 0, total + len(data))
+
+    def _entries(self, index: mmap.mmap) -> List[Tuple[bytes, int, int]]:
+        entries = []
+        for key, size, used in SLOT.iter_unpack(index[HEADER.size:HEADER.size + SLOT.size * self.slots]):
+            if key != EMPTY_KEY:
+                entries.append((key, size, used))
+        return entries
+
+    def _evict(self, index: mmap.mmap, incoming: int):
+        """Drop the least recently used entries and rebuild the table; caller holds the lock"""
+        entries = sorted(self._entries(index), key=lambda entry: entry[2], reverse=True)
+        byte_budget = self.max_bytes * EVICT_TO - incoming
+        count_budget = int(self.slots * MAX_LOAD * EVICT_TO)
+        kept = []
+        total = 0
+        for key, size, used in entries:
+            if len(kept) < count_budget and total + size <= byte_budget:
+                kept.append((key, size, used))
+                total += size
+            else:
+                try:
+                    os.unlink(self._object_path(key))
+                except OSError:
+                    pass
+
+        index[HEADER.size:] = bytes(SLOT.size * self.slots)
+        for key, size, used in kept:
+            slot, _ = self._find(index, key)
+            SLOT.pack_into(index, HEADER.size + slot * SLOT.size, key, size, used)
+        HEADER.pack_into(index, 0, INDEX_MAGIC, INDEX_VERSION, self.slots, len(kept), 0, total)
+
+    def convert(self, converter: "JSXConverter", html: str, workers: int = 0) -> str:
+        """converter.convert(html, workers), from the cache when an earlier run stored it"""
+        key = self.key(converter.fingerprint(), html)
+        jsx = self.get(key)
+        if jsx is None:
+            jsx = converter._convert(html, workers)
+            self.put(key, jsx)
+        return jsx
+
+    def stats(self) -> dict:
+        index = self._index()
+        _, _, slots, count, _, total = HEADER.unpack_from(index)
+        return {"entries": count, "bytes": total, "slots": slots, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
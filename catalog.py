@@ -0,0 +1,220 @@
+"""Component definitions stored as a directory of JSON files.
+
+    catalog/
+      manifest.json       registry order, and the tags and data-slots of every family
+      card.json           {"components": {"Card": {...}, "CardHeader": {...}, ...}}
+      dialog.json
+      ...
+
+Only the manifest is read up front. A family file is deserialized the first
+time a document contains one of the elements its components match on.
+
+    python catalog.py export DIRECTORY   # write registry.COMPONENTS as a catalog
+"""
+import json
+import os
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from components import Component
+from matcher import SLOT_ATTRIBUTE
+
+MANIFEST_NAME = "manifest.json"
+CATALOG_VERSION = 1
+
+_START_TAG_RE = re.compile(r"<([a-zA-Z][^\s/>]*)")
+_SLOT_RE = re.compile(r"""\sdata-slot\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+_WORD_RE = re.compile(r"[A-Z][a-z0-9]*|[a-z0-9]+")
+
+# (tag, data-slot) an entry requires; a None slot means the tag alone
+MatchKey = Tuple[str, Optional[str]]
+
+
+def document_keys(html: str) -> Tuple[Set[str], Set[str]]:
+    """Tag names and data-slot values appearing in html"""
+    tags = {tag.lower() for tag in _START_TAG_RE.findall(html)}
+    slots = {next(value for value in match if value) for match in _SLOT_RE.findall(html) if any(match)}
+    return tags, slots
+
+
+def match_key(component: Component) -> MatchKey:
+    slot = component.match_pattern['data_attributes'].get(SLOT_ATTRIBUTE)
+    return component.tag, None if slot is None else str(slot)
+
+
+def family_name(component: Component, roots: Set[str]) -> str:
+    """The shortest root name this one starts with, else its first word.
+
+    CardHeader belongs to Card and NavigationMenuLink to NavigationMenu; the
+    Dialog* components, which have no bare Dialog entry, share "Dialog".
+    """
+    words = _WORD_RE.findall(component.name)
+    for size in range(1, len(words) + 1):
+        prefix = "".join(words[:size])
+        if prefix in roots:
+            return prefix
+    return words[0] if words else component.name
+
+
+def family_roots(names: Iterable[str]) -> Set[str]:
+    """Names that other names extend by whole words, such as Card for CardHeader"""
+    names = set(names)
+    roots = set()
+    for name in names:
+        words = _WORD_RE.findall(name)
+        roots.update("".join(words[:size]) for size in range(1, len(words)))
+    return roots & names
+
+
+def _file_name(family: str) -> str:
+    return "-".join(word.lower() for word in _WORD_RE.findall(family)) + ".json"
+
+
+def component_to_json(component: Component) -> dict:
+    pattern = component.match_pattern
+    config = dict(component.config)
+    if 'output_blacklist' in config:
+        config['output_blacklist'] = sorted(config['output_blacklist'])
+    return {
+        "name": component.name,
+        "tag": component.tag,
+        "match_pattern": {
+            "signature_classes": sorted(pattern['signature_classes']),
+            "data_attributes": dict(pattern['data_attributes']),
+            "variant_patterns": {
+                var_type: {var_name: sorted(var_classes) for var_name, var_classes in variants.items()}
+                for var_type, variants in pattern['variant_patterns'].items()
+            },
+            "style_classes": sorted(pattern['style_classes']),
+        },
+        "config": config,
+    }
+
+
+def component_from_json(data: dict) -> Component:
+    pattern = data["match_pattern"]
+    config = dict(data["config"])
+    if 'output_blacklist' in config:
+        config['output_blacklist'] = set(config['output_blacklist'])
+    return Component(
+        name=data["name"],
+        tag=data["tag"],
+        match_pattern={
+            'signature_classes': set(pattern["signature_classes"]),
+            'data_attributes': dict(pattern["data_attributes"]),
+            'variant_patterns': {
+                var_type: {var_name: set(var_classes) for var_name, var_classes in variants.items()}
+                for var_type, variants in pattern["variant_patterns"].items()
+            },
+            'style_classes': set(pattern["style_classes"]),
+        },
+        config=config,
+    )
+
+
+def export_catalog(components: Dict[str, Component], directory: str) -> Dict[str, List[str]]:
+    """Write components as a catalog in directory; returns the keys of each family"""
+    roots = family_roots(component.name for component in components.values())
+    families: Dict[str, Dict[str, Component]] = {}
+    order = []
+    for key, component in components.items():
+        family = family_name(component, roots)
+        families.setdefault(family, {})[key] = component
+        order.append([key, family])
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"version": CATALOG_VERSION, "order": order, "families": {}}
+    for family, members in families.items():
+        file_name = _file_name(family)
+        with open(os.path.join(directory, file_name), "w", encoding="utf-8") as f:
+            json.dump({"components": {key: component_to_json(c) for key, c in members.items()}}, f, indent=2)
+            f.write("\n")
+        manifest["families"][family] = {
+            "file": file_name,
+            "match_keys": sorted({match_key(c) for c in members.values()}, key=lambda k: (k[0], k[1] or "")),
+        }
+    with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return {family: list(members) for family, members in families.items()}
+
+
+class Catalog:
+    """A catalog directory, loading each family file on first use"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != CATALOG_VERSION:
+            raise ValueError(f"{directory}: catalog version {manifest.get('version')!r}, expected {CATALOG_VERSION}")
+        self.order: List[Tuple[str, str]] = [(key, family) for key, family in manifest["order"]]
+        self.files: Dict[str, str] = {family: entry["file"] for family, entry in manifest["families"].items()}
+        # Families posted under the tag, or (tag, data-slot), their entries require
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._by_slot: Dict[MatchKey, Set[str]] = {}
+        for family, entry in manifest["families"].items():
+            for tag, slot in entry["match_keys"]:
+                if slot is None:
+                    self._by_tag.setdefault(tag, set()).add(family)
+                else:
+                    self._by_slot.setdefault((tag, slot), set()).add(family)
+        self._loaded: Dict[str, Dict[str, Component]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def families(self) -> List[str]:
+        return list(self.files)
+
+    @property
+    def loaded_families(self) -> List[str]:
+        return list(self._loaded)
+
+    def families_for(self, tags: Iterable[str], slots: Iterable[str]) -> FrozenSet[str]:
+        """Families with an entry that could match an element with one of tags and slots"""
+        slots = set(slots)
+        needed = set()
+        for tag in tags:
+            needed.update(self._by_tag.get(tag, ()))
+            for slot in slots:
+                needed.update(self._by_slot.get((tag, slot), ()))
+        return frozenset(needed)
+
+    def families_for_document(self, html: str) -> FrozenSet[str]:
+        return self.families_for(*document_keys(html))
+
+    def fingerprint(self) -> str:
+        """Checksum of the manifest and every family file, without deserializing them"""
+        from snapshot import files_fingerprint
+        return files_fingerprint([MANIFEST_NAME] + sorted(self.files.values()), self.directory)
+
+    def load_family(self, family: str) -> Dict[str, Component]:
+        members = self._loaded.get(family)
+        if members is None:
+            with self._lock:
+                members = self._loaded.get(family)
+                if members is None:
+                    with open(os.path.join(self.directory, self.files[family]), encoding="utf-8") as f:
+                        data = json.load(f)
+                    members = {key: component_from_json(entry) for key, entry in data["components"].items()}
+                    self._loaded[family] = members
+        return members
+
+    def components(self, families: Optional[Iterable[str]] = None) -> Dict[str, Component]:
+        """The entries of families (all by default), in registry order"""
+        wanted = set(self.files if families is None else families)
+        for family in wanted:
+            self.load_family(family)
+        return {key: self._loaded[family][key] for key, family in self.order if family in wanted}
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3 or sys.argv[1] != "export":
+        sys.exit(f"usage: {sys.argv[0]} export DIRECTORY")
+    from registry import COMPONENTS
+
+    exported = export_catalog(COMPONENTS, sys.argv[2])
+    print(f"Exported {len(COMPONENTS)} components in {len(exported)} families to {sys.argv[2]}")
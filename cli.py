@@ -0,0 +1,253 @@
+"""Convert HTML files or directory trees to shadcn JSX.
+
+    python cli.py pages/ -o src/pages/      # pages/**/*.html -> src/pages/**/*.jsx
+    python cli.py index.html about.html     # index.jsx, about.jsx alongside
+    python cli.py < page.html > page.jsx    # stdin to stdout
+    python cli.py --stream < big.html       # stdin to stdout without building a DOM
+
+Each run records the content hash of every input it converted in a manifest
+(.jsx-manifest.json in the output directory, or the current one). Inputs whose
+hash, converter fingerprint and output file are unchanged are skipped.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set
+
+from converter import JSXConverter
+from parsers import DEFAULT_PARSER
+from profiles import PROFILE_ALL, PROFILES
+
+if TYPE_CHECKING:
+    from batch import ConversionResult
+
+INPUT_SUFFIXES = (".html", ".htm")
+OUTPUT_SUFFIX = ".jsx"
+MANIFEST_NAME = ".jsx-manifest.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class Job:
+    source: str
+    target: str
+    digest: str
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def find_inputs(path: str, output_dir: Optional[str]) -> Iterator[Job]:
+    """Every HTML file under path, paired with its output path"""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(INPUT_SUFFIXES):
+                    source = os.path.join(root, name)
+                    relative = os.path.relpath(source, path)
+                    yield Job(source, _target(relative, output_dir or path), "")
+    else:
+        yield Job(path, _target(os.path.basename(path), output_dir or os.path.dirname(path)), "")
+
+
+def _target(relative: str, output_dir: str) -> str:
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + OUTPUT_SUFFIX)
+
+
+def write_atomic(path: str, text: str):
+    """Replace path with text; readers see either the old file or the new one"""
+    import tempfile
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".jsx-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class Manifest:
+    """Input hashes of the outputs written by earlier runs with the same converter"""
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, dict] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION and data.get("fingerprint") == fingerprint:
+            self.entries = data.get("files", {})
+
+    def _key(self, target: str) -> str:
+        return os.path.relpath(target, os.path.dirname(os.path.abspath(self.path)))
+
+    def is_current(self, job: Job) -> bool:
+        entry = self.entries.get(self._key(job.target))
+        if entry is None or entry["source"] != job.digest:
+            return False
+        try:
+            return os.path.getsize(job.target) == entry["size"]
+        except OSError:
+            return False
+
+    def record(self, job: Job, size: int):
+        self.entries[self._key(job.target)] = {"source": job.digest, "size": size}
+
+    def save(self):
+        data = {"version": MANIFEST_VERSION, "fingerprint": self.fingerprint, "files": self.entries}
+        write_atomic(self.path, json.dumps(data, indent=1, sort_keys=True) + "\n")
+
+
+def _read_documents(jobs: List[Job]) -> Iterator[str]:
+    for job in jobs:
+        with open(job.source, "rb") as f:
+            yield f.read().decode("utf-8")
+
+
+def _convert_split(converter: JSXConverter, job: Job, workers: int) -> Iterator["ConversionResult"]:
+    """One document, rendered by workers processes"""
+    from batch import ConversionResult
+
+    html = next(_read_documents([job]))
+    try:
+        yield ConversionResult(0, jsx=converter.convert(html, workers=workers))
+    except Exception as e:
+        yield ConversionResult(0, error=f"{type(e).__name__}: {e}")
+
+
+def convert_tree(converter: JSXConverter, inputs: List[str], output_dir: Optional[str], jobs: int,
+                 manifest: Optional[Manifest]) -> int:
+    """Convert every input that changed; returns the number of failures.
+
+    Of inputs that would write the same output, such as page.html and
+    page.htm, only the first is converted and the others are failures.
+    """
+    pending = []
+    skipped = failed = 0
+    # Real paths of the inputs taken so far, and of each output to the input writing it
+    seen: Set[str] = set()
+    writers: Dict[str, str] = {}
+    for path in inputs:
+        for job in find_inputs(path, output_dir):
+            source = os.path.realpath(job.source)
+            if source in seen:
+                # The same file named twice
+                continue
+            seen.add(source)
+            target = os.path.realpath(job.target)
+            if target in writers:
+                failed += 1
+                print(f"{job.source}: {writers[target]} already writes {job.target}", file=sys.stderr)
+                continue
+            writers[target] = job.source
+            with open(job.source, "rb") as f:
+                data = f.read()
+            job.digest = content_digest(data)
+            if manifest is not None and manifest.is_current(job):
+                skipped += 1
+                continue
+            try:
+                data.decode("utf-8")
+            except UnicodeDecodeError as e:
+                failed += 1
+                print(f"{job.source}: {e}", file=sys.stderr)
+                continue
+            pending.append(job)
+
+    if len(pending) == 1 and jobs > 1:
+        # Nothing to spread over the pool but the one document itself
+        results = _convert_split(converter, pending[0], jobs)
+    else:
+        # Documents are read again as the pool asks for them, so memory stays bounded
+        results = converter.convert_many(_read_documents(pending), workers=jobs)
+    converted = 0
+    try:
+        for job, result in zip(pending, results):
+            if not result.ok:
+                failed += 1
+                print(f"{job.source}: {result.error}", file=sys.stderr)
+                continue
+            write_atomic(job.target, result.jsx)
+            converted += 1
+            if manifest is not None:
+                manifest.record(job, os.path.getsize(job.target))
+    finally:
+        # Keep what was converted even if the run is interrupted
+        if manifest is not None:
+            manifest.save()
+    print(f"converted {converted}, skipped {skipped} unchanged, failed {failed}", file=sys.stderr)
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="*", help="HTML files or directories; '-' or none reads stdin")
+    parser.add_argument("-o", "--output", help="directory for the .jsx files (default: next to the inputs)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes; 0 uses every CPU")
+    parser.add_argument("--parser", default=DEFAULT_PARSER, help="'lxml' or a BeautifulSoup parser name")
+    parser.add_argument("--profile", default=PROFILE_ALL, choices=PROFILES)
+    parser.add_argument("--catalog", help="load components from this catalog directory instead of registry.py")
+    parser.add_argument("--iterative", action="store_true", help="walk with an explicit stack, for very deep markup")
+    parser.add_argument("--memoize", action="store_true", help="render repeated subtrees once, for very repetitive pages parsed with lxml")
+    parser.add_argument("--manifest", help=f"manifest path (default: {MANIFEST_NAME} in the output directory)")
+    parser.add_argument("--force", action="store_true", help="convert every input, even unchanged ones")
+    parser.add_argument("--cache", help="directory of a conversion cache shared across runs and projects")
+    parser.add_argument("--cache-size", type=int, default=256, help="cache size limit in MiB (default: 256)")
+    parser.add_argument("--stream", action="store_true",
+                        help="convert stdin from html.parser events as it arrives, without building a DOM")
+    args = parser.parse_args(argv)
+    reads_stdin = not args.inputs or args.inputs == ["-"]
+    if args.stream:
+        if not reads_stdin:
+            parser.error("--stream only applies to stdin")
+        unsupported = [flag for flag, used in (("--parser", args.parser != DEFAULT_PARSER), ("--cache", args.cache),
+                                               ("--jobs", args.jobs != 1)) if used]
+        if unsupported:
+            parser.error(f"--stream converts with html.parser in this process; drop {', '.join(unsupported)}")
+
+    options = {"parser": args.parser, "profile": args.profile, "iterative": args.iterative,
+               "memoize": args.memoize}
+    if args.cache:
+        from cache import ConversionCache
+        options["cache"] = ConversionCache(args.cache, max_bytes=args.cache_size * 1024 * 1024)
+    if args.catalog:
+        converter = JSXConverter.from_catalog(args.catalog, **options)
+    else:
+        converter = JSXConverter(**options)
+
+    if args.jobs == 0:
+        from batch import available_cpus
+        args.jobs = available_cpus()
+
+    if reads_stdin:
+        if args.stream:
+            from streaming import convert_file
+            convert_file(converter, sys.stdin, sys.stdout)
+        else:
+            # Converted as a file would be, so the output doesn't depend on where the input came from
+            sys.stdout.write(converter.convert(sys.stdin.read(), workers=args.jobs if args.jobs > 1 else 0))
+        sys.stdout.write("\n")
+        return 0
+    manifest = Manifest(args.manifest or os.path.join(args.output or ".", MANIFEST_NAME), converter.fingerprint())
+    if args.force:
+        manifest.entries.clear()
+    # A single job converts in this process
+    failed = convert_tree(converter, args.inputs, args.output, args.jobs if args.jobs > 1 else 0, manifest)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
-from typing import Dict, Set, Optional, Any
-from tailwind_merge import TailwindMerge
+from typing import Dict, FrozenSet, Set, Optional, Any, Tuple
+from merge import MergeService, get_merge_service
 
 @dataclass
 class Component:
@@ -19,10 +19,33 @@ class Component:
         'default_variants': dict(),
         'skip_this_element': False,
     })
-    tw_merger: TailwindMerge = field(init=False, repr=False)
+    tw_merger: MergeService = field(init=False, repr=False, compare=False)
+    managed_classes: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    variant_classes: Dict[Tuple[str, str], FrozenSet[str]] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self.tw_merger = TailwindMerge()
+        self.tw_merger = get_merge_service()
+        self.variant_classes = {
+            (var_type, var_name): frozenset(var_classes)
+            for var_type, variants in self.match_pattern['variant_patterns'].items()
+            for var_name, var_classes in variants.items()
+        }
+        # Signature, style and every variant class are owned by the component
+        self.managed_classes = frozenset().union(
+            self.match_pattern['signature_classes'],
+            self.match_pattern['style_classes'],
+            *self.variant_classes.values()
+        )
+
+    def __getstate__(self):
+        # The merge service is process-wide; reattach it instead of pickling it
+        state = self.__dict__.copy()
+        del state['tw_merger']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tw_merger = get_merge_service()
 
     def match_core(self, tag_name: str, element_classes: Set[str]) -> bool:
         """Check if element matches component's core identity"""
@@ -52,13 +75,5 @@ class Component:
 
     def get_custom_classes(self, element_classes: Set[str]) -> str:
         """Get merged custom classes after removing component-managed ones"""
-        managed_classes = self.match_pattern['signature_classes'].copy()
-        managed_classes.update(self.match_pattern['style_classes'])
-        
-        # Add all possible variant classes
-        for var_type in self.match_pattern['variant_patterns']:
-            for var_classes in self.match_pattern['variant_patterns'][var_type].values():
-                managed_classes.update(var_classes)
-        
-        custom_classes = element_classes - managed_classes
+        custom_classes = element_classes - self.managed_classes
         return self.tw_merger.merge(" ".join(custom_classes))
\ No newline at end of file
@@ -1,7 +1,49 @@
-from bs4 import BeautifulSoup, Tag, Doctype
+import io
+import threading
+from operator import attrgetter
 from components import Component
-from typing import Dict, Tuple, Optional, Set
-from tailwind_merge import TailwindMerge
+from matcher import CompiledComponent, ComponentIndex, SLOT_ATTRIBUTE
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Tuple, Optional, Set, TextIO
+from lru import striped_lru_cache
+from merge import get_merge_service
+from parsers import DEFAULT_PARSER, DOCTYPE, LXML_PARSER, lxml_attributes, lxml_contents, lxml_markup, parse_lxml
+from profiles import PROFILE_ALL, PROFILES, select_components
+from subtree import DOCTYPE_KEY, MARKER, SubtreeMemo, attributes_key, markup_digest
+from writer import JSXWriter
+
+if TYPE_CHECKING:
+    from batch import ConversionResult
+    from cache import ConversionCache
+    from catalog import Catalog
+
+# Children still to be written: (nodes, their indent level, close parent afterwards)
+ChildWalk = Tuple[List, int, bool]
+StartNode = Callable[[Any, JSXWriter, int], Optional[ChildWalk]]
+# Key standing for a node's whole subtree, None for nodes not memoized (see subtree.py)
+SubtreeKey = Callable[[Any], Optional[Hashable]]
+# Matched component, its variants and the merged className of unmanaged classes
+MatchResult = Tuple[Optional[CompiledComponent], dict, Optional[str]]
+
+DEFAULT_MATCH_CACHE_SIZE = 4096
+
+# Bump when a change alters the JSX written for some input
+CONVERTER_VERSION = 1
+# Modules whose code decides the JSX written for a given registry
+RENDERING_FILES = ("converter.py", "writer.py", "parsers.py", "profiles.py", "merge.py", "subtree.py")
+# Distributions whose behaviour shows in the output
+OUTPUT_DEPENDENCIES = ("beautifulsoup4", "lxml", "tailwind-merge")
+
+# bs4 is imported on first use by _require_bs4, keeping `import converter` cheap
+BeautifulSoup = Tag = Doctype = None
+
+
+def _require_bs4():
+    global BeautifulSoup, Tag, Doctype
+    if BeautifulSoup is None:
+        import bs4
+        # BeautifulSoup last: another thread takes it being set to mean all three are
+        Tag, Doctype = bs4.Tag, bs4.Doctype
+        BeautifulSoup = bs4.BeautifulSoup
 
 class JSXConverter:
     SELF_CLOSING_TAGS = {
@@ -10,120 +52,432 @@ class JSXConverter:
         "source", "track", "wbr"
     }
 
-    def __init__(self, components: Dict[str, Component]):
+    def __init__(self, components: Optional[Dict[str, Component]] = None, iterative: bool = False, parser: str = DEFAULT_PARSER,
+                 match_cache_size: int = DEFAULT_MATCH_CACHE_SIZE, index: Optional[ComponentIndex] = None,
+                 profile: str = PROFILE_ALL, catalog: Optional["Catalog"] = None,
+                 cache: Optional["ConversionCache"] = None, memoize: bool = False):
+        """parser is "lxml" to parse straight into lxml elements without a
+        BeautifulSoup tree, or any BeautifulSoup feature name ("html.parser",
+        "html5lib", ...)
+
+        Match results are memoized per (tag, class list, matched attributes)
+        across documents in an LRU cache of match_cache_size entries.
+
+        Without components, registry.COMPONENTS is used. Nothing is loaded
+        until the first conversion: the index is built (or, for the bundled
+        registry, read from its snapshot) then, leaving out entries that can
+        never win a match. index may be a ComponentIndex already built for
+        components.
+
+        profile restricts matching to one shadcn generation: "v4" (data-slot
+        markup), "legacy" (the *Legacy entries) or "all".
+
+        With a catalog (see from_catalog), each document is converted against
+        only the component families its tags and data-slots can match.
+
+        cache is an optional cache.ConversionCache that convert() reads from
+        and stores to, keyed by the input and this converter's fingerprint.
+
+        With memoize, each distinct subtree that repeats (in a document or
+        across documents) is matched and rendered once and its JSX reused,
+        re-indented, for the other copies; see subtree.py. It applies to the
+        recursive walk only, not to iterative. It pays off with parser="lxml"
+        only: keying a BeautifulSoup tree visits every node first, which
+        costs about as much as rendering it.
+
+        One converter may be used from any number of threads at once. The
+        compiled registry is never modified after prepare(), the match and
+        merge caches are striped (see lru.py), and each thread keeps its own
+        subtree memo and TailwindMerge.
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown registry profile {profile!r}, expected one of {', '.join(PROFILES)}")
         self.components = components
-        self.tw_merger = TailwindMerge()
+        # Whether components are registry.COMPONENTS, loaded by prepare or from_registry
+        self.bundled = components is None and catalog is None
+        self.iterative = iterative
+        self.parser = parser
+        self.profile = profile
+        self.match_cache_size = match_cache_size
+        self.index = index
+        self.catalog = catalog
+        self.cache = cache
+        self.memoize = memoize
+        self._fingerprint: Optional[str] = None
+        # Catalog families loaded so far and the converter over them, replaced together
+        self._catalog_state: Tuple[FrozenSet[str], Optional["JSXConverter"]] = (frozenset(), None)
+        # Held only while loading or building something; converting takes no lock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.tw_merger = get_merge_service()
+        self._match_cached = striped_lru_cache(self._match, match_cache_size)
 
-    def convert(self, html: str) -> str:
-        soup = BeautifulSoup(html, "html.parser")
-        output = []
-        
-        for element in soup.contents:
-            processed = self.process_element(element)
-            if processed:
-                output.append(processed)
-                
-        return "\n".join(output)
+    @classmethod
+    def from_registry(cls, snapshot_path: Optional[str] = None, **options) -> "JSXConverter":
+        """Converter for registry.COMPONENTS, loaded from its compiled snapshot"""
+        from snapshot import load_registry
+        components, index = load_registry(snapshot_path)
+        converter = cls(components, index=index, **options)
+        converter.bundled = True
+        return converter
+
+    @classmethod
+    def from_catalog(cls, directory: str, **options) -> "JSXConverter":
+        """Converter for a catalog directory written by catalog.export_catalog"""
+        from catalog import Catalog
+        return cls(catalog=Catalog(directory), **options)
+
+    def prepare(self) -> "JSXConverter":
+        """Load the registry and build the index now rather than on first use.
+
+        Safe to race: one thread loads, and the index is published last, so a
+        thread that finds it set also finds the components it was built from.
+        """
+        if self.index is None:
+            with self._lock:
+                if self.index is None:
+                    self._load()
+        return self
+
+    def _load(self):
+        components, index = self.components, None
+        if components is None and self.catalog is not None:
+            components = self.catalog.components()
+        elif components is None:
+            from snapshot import load_registry
+            components, index = load_registry()
+        profiled = select_components(components, self.profile)
+        if profiled is not components or index is None:
+            from analyzer import dispatch_table
+            index = ComponentIndex(dispatch_table(profiled))
+        self.components = profiled
+        self.index = index
+
+    def fingerprint(self) -> str:
+        """Digest of everything that decides this converter's output.
+
+        Covers CONVERTER_VERSION, the rendering code, the registry (or catalog,
+        or custom components), the output-relevant options and the installed
+        versions of OUTPUT_DEPENDENCIES. Two converters with the same
+        fingerprint write the same JSX for the same input. Computed once, from
+        the files as they are on first call.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = self._compute_fingerprint()
+        return self._fingerprint
+
+    def _compute_fingerprint(self) -> str:
+        import hashlib
+        import json
+        from importlib import metadata
+        from snapshot import files_fingerprint, registry_fingerprint
+
+        parts = [
+            f"version={CONVERTER_VERSION}",
+            files_fingerprint(RENDERING_FILES),
+            registry_fingerprint(),
+            f"parser={self.parser}",
+            f"profile={self.profile}",
+        ]
+        for dist in OUTPUT_DEPENDENCIES:
+            try:
+                parts.append(f"{dist}={metadata.version(dist)}")
+            except metadata.PackageNotFoundError:
+                parts.append(f"{dist}=")
+        if self.catalog is not None:
+            parts.append(self.catalog.fingerprint())
+        elif not self.bundled:
+            from catalog import component_to_json
+            parts.append(json.dumps({key: component_to_json(c) for key, c in self.components.items()}))
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def for_document(self, html: str) -> "JSXConverter":
+        """The converter that should handle html: self, or one narrowed to what html can match"""
+        if self.catalog is not None:
+            families = self.catalog.families_for_document(html)
+            loaded, converter = self._catalog_state
+            if converter is None or not families <= loaded:
+                with self._lock:
+                    loaded, converter = self._catalog_state
+                    if converter is None or not families <= loaded:
+                        # Entries of families the document doesn't use can't match it, so loaded ones stay
+                        loaded = loaded | families
+                        converter = self._narrowed(self.catalog.components(loaded))
+                        self._catalog_state = (loaded, converter)
+            return converter
+        return self
+
+    @property
+    def subtrees(self) -> Optional[SubtreeMemo]:
+        """This thread's subtree memo, or None when not memoizing"""
+        if not self.memoize or self.iterative:
+            return None
+        memo = getattr(self._local, "subtrees", None)
+        if memo is None:
+            memo = self._local.subtrees = SubtreeMemo()
+        return memo
+
+    def _narrowed(self, components: Dict[str, Component]) -> "JSXConverter":
+        return JSXConverter(components, iterative=self.iterative, parser=self.parser,
+                            match_cache_size=self.match_cache_size, profile=self.profile, memoize=self.memoize)
+
+    def convert(self, html: str, workers: int = 0) -> str:
+        """JSX for html; with workers > 1, one document is rendered by that many processes.
+
+        Parallel conversion cuts the parsed tree into runs of sibling nodes
+        and renders them in worker processes forked from this one, then
+        stitches their JSX into the enclosing elements in order. The output is
+        the same as converting sequentially. It needs the fork start method
+        and pays for its pool per call, so it suits single very large pages;
+        for many documents, see convert_many.
+        """
+        if self.cache is not None:
+            return self.cache.convert(self, html, workers)
+        return self._convert(html, workers)
+
+    def _convert(self, html: str, workers: int = 0) -> str:
+        buffer = io.StringIO()
+        self.convert_to(html, buffer, workers)
+        return buffer.getvalue()
+
+    def convert_many(self, documents: Iterable[str], workers: Optional[int] = None, **options) -> Iterator["ConversionResult"]:
+        """Convert documents in a pool of worker processes, yielding results in order.
+
+        A document that fails to convert yields a result carrying the error
+        instead of ending the batch. See batch.convert_many for the options.
+        """
+        from batch import convert_many
+        return convert_many(self, documents, workers=workers, **options)
+
+    def convert_to(self, html: str, stream: TextIO, workers: int = 0) -> None:
+        """Convert html and write the JSX to stream as it is rendered"""
+        converter = self.for_document(html)
+        if converter is not self:
+            converter.convert_to(html, stream, workers)
+            return
+        self.prepare()
+        writer = JSXWriter(stream)
+        if self.parser == LXML_PARSER:
+            nodes, start, contents = parse_lxml(html), self._start_lxml_node, lxml_contents
+        else:
+            _require_bs4()
+            nodes, start, contents = BeautifulSoup(html, self.parser).contents, self._start_element, attrgetter("contents")
+        # Parts are re-indented by replacing MARKER, so it must not occur in the document
+        if workers > 1 and MARKER not in html:
+            from batch import write_split
+            write_split(self, nodes, writer, start, contents, workers)
+        else:
+            self._write_nodes(nodes, writer, 0, start)
 
     def process_element(self, el, indent_level=0) -> str:
+        if self.catalog is not None:
+            converter = self.for_document(str(el))
+            if converter is not self:
+                return converter.process_element(el, indent_level)
+        self.prepare()
+        _require_bs4()
+        buffer = io.StringIO()
+        self._write_nodes([el], JSXWriter(buffer), indent_level, self._start_element)
+        return buffer.getvalue()
+
+    def _write_nodes(self, nodes: Iterable, writer: JSXWriter, indent_level: int, start: StartNode):
+        memo = self.subtrees
+        if self.iterative:
+            self._walk(nodes, writer, indent_level, start)
+        elif memo is not None:
+            memo.begin_document()
+            if start == self._start_lxml_node:
+                subtree_key = self._lxml_subtree_key
+            else:
+                ids: Dict[int, int] = {}
+                for node in nodes:
+                    self._bs4_structure(node, ids, memo)
+                subtree_key = lambda el: ids.get(id(el))
+            self._write_memoized(nodes, writer, indent_level, start, subtree_key, memo)
+        else:
+            for node in nodes:
+                self._write_element(node, writer, indent_level, start)
+
+    def _write_element(self, el, writer: JSXWriter, indent_level: int, start: StartNode):
+        walk = start(el, writer, indent_level)
+        if walk:
+            children, child_indent, close = walk
+            for child in children:
+                self._write_element(child, writer, child_indent, start)
+            if close:
+                writer.close()
+
+    def _walk(self, nodes: Iterable, writer: JSXWriter, indent_level: int, start: StartNode):
+        """Explicit-stack equivalent of _write_element for arbitrarily deep trees"""
+        stack = [(iter(nodes), indent_level, False)]
+        while stack:
+            children, child_indent, close = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if close:
+                    writer.close()
+                continue
+
+            walk = start(child, writer, child_indent)
+            if walk:
+                children, child_indent, close = walk
+                stack.append((iter(children), child_indent, close))
+
+    def _bs4_structure(self, el, ids: Dict[int, int], memo: SubtreeMemo) -> Optional[Hashable]:
+        """Key of el among its siblings' keys; ids gets the structural id of each element below"""
+        if isinstance(el, Doctype):
+            return DOCTYPE_KEY
+        if not isinstance(el, Tag):
+            text = str(el).strip()
+            return None if MARKER in text else text
+        child_keys = tuple([self._bs4_structure(child, ids, memo) for child in el.contents])
+        attrs_key = attributes_key(el.attrs)
+        if attrs_key is None or None in child_keys:
+            return None
+        sid = ids[id(el)] = memo.intern((el.name, attrs_key, child_keys))
+        return sid
+
+    @staticmethod
+    def _lxml_subtree_key(node) -> Optional[bytes]:
+        # libxml2 turns NUL into U+FFFD, so MARKER can't occur in the markup
+        if node is DOCTYPE or isinstance(node, str) or not isinstance(node.tag, str):
+            return None
+        # A digest, so the memo holds a fixed size per subtree rather than its markup
+        return markup_digest(lxml_markup(node))
+
+    def _write_memoized(self, nodes: Iterable, writer: JSXWriter, indent_level: int, start: StartNode,
+                        subtree_key: SubtreeKey, memo: SubtreeMemo):
+        """_write_element for each of nodes, reusing the rendered JSX of recurring subtrees"""
+        for node in nodes:
+            key = subtree_key(node)
+            if key is not None:
+                template = memo.templates.get(key)
+                if template is None and memo.recurs(key):
+                    buffer = io.StringIO()
+                    self._write_memoized_node(node, JSXWriter(buffer, base=MARKER), 0, start, subtree_key, memo)
+                    template = buffer.getvalue()
+                    memo.store(key, template)
+                if template is not None:
+                    if template:
+                        writer.item(template.replace(MARKER, writer.indent(indent_level)))
+                    continue
+            self._write_memoized_node(node, writer, indent_level, start, subtree_key, memo)
+
+    def _write_memoized_node(self, node, writer: JSXWriter, indent_level: int, start: StartNode,
+                             subtree_key: SubtreeKey, memo: SubtreeMemo):
+        walk = start(node, writer, indent_level)
+        if walk:
+            children, child_indent, close = walk
+            self._write_memoized(children, writer, child_indent, start, subtree_key, memo)
+            if close:
+                writer.close()
+
+    def _start_element(self, el, writer: JSXWriter, indent_level: int) -> Optional[ChildWalk]:
+        """Write everything up to el's children and say which children follow"""
         if isinstance(el, Doctype):
-            return "<!DOCTYPE html>"
-            
+            writer.item("<!DOCTYPE html>")
+            return None
+
         if not isinstance(el, Tag):
-            return self._format_text(str(el).strip(), indent_level)
-            
-        component, variants = self._find_matching_component(el)
+            text = self._format_text(str(el).strip(), writer.indent(indent_level))
+            if text:
+                writer.item(text)
+            return None
+
+        return self._start_tag(el.name, el.attrs, el.contents, writer, indent_level)
+
+    def _start_lxml_node(self, node, writer: JSXWriter, indent_level: int) -> Optional[ChildWalk]:
+        if node is DOCTYPE:
+            writer.item("<!DOCTYPE html>")
+            return None
+
+        if isinstance(node, str) or not isinstance(node.tag, str):
+            # Text, or a comment / processing instruction written as its text
+            text = node if isinstance(node, str) else node.text or ""
+            text = self._format_text(text.strip(), writer.indent(indent_level))
+            if text:
+                writer.item(text)
+            return None
+
+        return self._start_tag(node.tag, lxml_attributes(node), lxml_contents(node), writer, indent_level)
+
+    def _start_tag(self, name: str, attrs: dict, contents: Optional[List], writer: JSXWriter, indent_level: int) -> Optional[ChildWalk]:
+        component, variants, class_name = self._find_matching_component(name, attrs)
         if component:
-            return self._render_component(el, component, variants, indent_level)
-            
-        return self._render_html_element(el, indent_level)
+            return self._start_component(attrs, contents, component, variants, class_name, writer, indent_level)
+        return self._start_html_element(name, attrs, contents, writer, indent_level)
     
-    def _find_matching_component(self, el: Tag) -> Tuple[Optional[Component], dict]:
-        el_classes = set(el.get("class", []))
-        el_attrs = el.attrs
+    def _find_matching_component(self, name: str, el_attrs: dict) -> MatchResult:
+        """Cached match for the element; the variants dict is shared and must not be modified"""
+        # Multi-valued attributes (rel, headers, ...) are lists; tuples are hashable and, like the
+        # lists, never equal a registry value
+        match_values = tuple(tuple(value) if isinstance(value, list) else value
+                             for value in map(el_attrs.get, self.index.match_attributes))
+        return self._match_cached(name, tuple(el_attrs.get("class", ())), match_values)
 
-        for component in self.components.values():
-            
-            if el.name != component.tag:
-                continue
+    def match_cache_info(self):
+        """Hits, misses, maxsize and current size of the match cache"""
+        return self._match_cached.cache_info()
+
+    def _match(self, name: str, classes: Tuple[str, ...], match_values: Tuple[Any, ...]) -> MatchResult:
+        el_attrs = {
+            attr: value
+            for attr, value in zip(self.index.match_attributes, match_values)
+            if value is not None
+        }
+        el_classes = set(classes)
 
-            
-            data_match = all(
-                el_attrs.get(attr) == str(value)
-                for attr, value in component.match_pattern['data_attributes'].items()
-            )
-            if not data_match:
+        el_mask = self.index.class_mask(el_classes)
+        slot = el_attrs.get(SLOT_ATTRIBUTE)
+
+        for component in self.index.candidates(name, el_classes, slot):
+            if not component.match_data(el_attrs):
                 continue
 
-            
-            if not component.match_pattern['signature_classes'].issubset(el_classes):
+            if not component.match_core(el_mask):
                 continue
 
-            
-            detected_variants = {}
-            for var_type, variants in component.match_pattern['variant_patterns'].items():
-                for var_name, var_classes in variants.items():
-                    if var_classes.issubset(el_classes):
-                        detected_variants[var_type] = var_name
-                        break
+            detected_variants = component.detect_variants(el_mask)
+            return component, detected_variants, self._custom_class_name(el_classes, component)
 
-            return component, detected_variants
+        return None, {}, None
 
-        return None, {}
+    def _custom_class_name(self, el_classes: Set[str], component: CompiledComponent) -> Optional[str]:
+        custom_classes = el_classes - component.managed_classes
+        if custom_classes:
+            return self.tw_merger.merge(" ".join(custom_classes))
+        return None
     
 
-    def _render_component(self, el: Tag, component: Component, variants: dict, indent_level: int) -> str:
-        
-        if component.config.get('skip_this_element'):
-            children = []
-            for child in el.contents:
-                # Process children at CURRENT indent level (no nesting increase)
-                processed = self.process_element(child, indent_level)
-                if processed:
-                    children.append(processed)
-            return "\n".join(children)
-        
-        attrs = self._build_component_attrs(el, component, variants)
+    def _start_component(self, el_attrs: dict, contents: List, component: CompiledComponent, variants: dict,
+                         class_name: Optional[str], writer: JSXWriter, indent_level: int) -> Optional[ChildWalk]:
+        if component.skip_this_element:
+            # Children are written at the CURRENT indent level (no nesting increase)
+            return contents, indent_level, False
+
+        attrs = self._build_component_attrs(el_attrs, component, variants, class_name)
         attrs_str = " ".join(attrs)
-        indent = "  " * indent_level
+        indent = writer.indent(indent_level)
+        header = f"{indent}<{component.name}{' ' + attrs_str if attrs_str else ''}"
 
-        if component.config.get('self_closing') or component.config.get('ignore_children'):
-            return f"{indent}<{component.name}{' ' + attrs_str if attrs_str else ''} />"
-    
-        children = [self.process_element(child, indent_level + 1) for child in el.contents]
-        children_str = "\n".join(filter(None, children))
-
-        if not children_str.strip():
-            return f"{indent}<{component.name}{' ' + attrs_str if attrs_str else ''} />"
-            
-        return (
-            f"{indent}<{component.name}{' ' + attrs_str if attrs_str else ''}>\n"
-            f"{children_str}\n"
-            f"{indent}</{component.name}>"
-        )
-    
+        if component.self_closing or component.ignore_children:
+            writer.item(f"{header} />")
+            return None
+
+        writer.open(header, f"{indent}</{component.name}>", self_closing=True)
+        return contents, indent_level + 1, True
 
-    def _build_component_attrs(self, el: Tag, component: Component, variants: dict) -> list:
+    def _build_component_attrs(self, el_attrs: dict, component: CompiledComponent, variants: dict, class_name: Optional[str]) -> list:
         attrs = []
-        el_classes = set(el.get("class", []))
-        
-        managed_classes = (
-            component.match_pattern['signature_classes'] |
-            component.match_pattern['style_classes']
-        )
-        for var_classes in component.match_pattern['variant_patterns'].values():
-            managed_classes.update({c for v in var_classes.values() for c in v})
-
-        custom_classes = el_classes - managed_classes
-        if custom_classes:
-            merged = self.tw_merger.merge(" ".join(custom_classes))
-            attrs.append(f'className="{merged}"')
+        if class_name:
+            attrs.append(f'className="{class_name}"')
 
         for var_type, var_name in variants.items():
             attrs.append(f'{var_type}="{var_name}"')
 
-        for attr, value in el.attrs.items():
-            if attr in component.config['output_blacklist']:
+        for attr, value in el_attrs.items():
+            if attr in component.output_blacklist:
                 continue
             if attr == "class":
                 continue
@@ -131,29 +485,21 @@ class JSXConverter:
 
         return attrs
 
-    def _render_html_element(self, el: Tag, indent_level: int) -> str:
-        indent = "  " * indent_level
+    def _start_html_element(self, name: str, el_attrs: dict, contents: List, writer: JSXWriter, indent_level: int) -> ChildWalk:
+        indent = writer.indent(indent_level)
         attrs = []
         
-        if "class" in el.attrs:
-            merged = self.tw_merger.merge(" ".join(el["class"]))
+        if "class" in el_attrs:
+            merged = self.tw_merger.merge(" ".join(el_attrs["class"]))
             attrs.append(f'className="{merged}"')
 
-        for attr, value in el.attrs.items():
+        for attr, value in el_attrs.items():
             if attr != "class":
                 attrs.append(f'{attr}="{value}"')
 
-        children = [self.process_element(child, indent_level + 1) for child in el.contents]
-        children_str = "\n".join(filter(None, children))
-
-        if not children_str and el.name in self.SELF_CLOSING_TAGS:
-            return f"{indent}<{el.name}{' ' + ' '.join(attrs) if attrs else ''} />"
-            
-        return (
-            f"{indent}<{el.name}{' ' + ' '.join(attrs) if attrs else ''}>\n"
-            f"{children_str}\n"
-            f"{indent}</{el.name}>"
-        )
+        header = f"{indent}<{name}{' ' + ' '.join(attrs) if attrs else ''}"
+        writer.open(header, f"{indent}</{name}>", self_closing=name in self.SELF_CLOSING_TAGS)
+        return contents, indent_level + 1, True
 
-    def _format_text(self, text: str, indent_level: int) -> str:
-        return "  " * indent_level + text if text.strip() else ""
\ No newline at end of file
+    def _format_text(self, text: str, indent: str) -> str:
+        return indent + text if text.strip() else ""
\ No newline at end of file
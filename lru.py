@@ -0,0 +1,54 @@
+"""LRU memoization that many threads can share.
+
+functools.lru_cache is safe to call from any number of threads, but on a
+free-threaded build every call takes the one lock of its cache. A striped
+cache spreads keys by hash over several independent lru_caches, so threads
+looking up different keys rarely wait for each other. Under the GIL only one
+thread runs at a time anyway, and a single plain lru_cache is used.
+"""
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from typing import Callable, Optional
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def gil_enabled() -> bool:
+    """False on a free-threaded build running without the GIL"""
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
+
+
+# Enough that a few dozen threads seldom share a stripe
+DEFAULT_STRIPES = 1 if gil_enabled() else 16
+
+
+class StripedLRUCache:
+    """function memoized in stripes independent LRU caches of maxsize / stripes entries"""
+
+    def __init__(self, function: Callable, maxsize: Optional[int], stripes: int):
+        stripe_size = None if maxsize is None else max(maxsize // stripes, 1)
+        self._stripes = tuple(lru_cache(maxsize=stripe_size)(function) for _ in range(stripes))
+
+    def __call__(self, *args):
+        stripes = self._stripes
+        return stripes[hash(args) % len(stripes)](*args)
+
+    def cache_info(self) -> CacheInfo:
+        infos = [stripe.cache_info() for stripe in self._stripes]
+        maxsize = None if infos[0].maxsize is None else sum(info.maxsize for info in infos)
+        return CacheInfo(sum(info.hits for info in infos), sum(info.misses for info in infos), maxsize,
+                         sum(info.currsize for info in infos))
+
+    def cache_clear(self):
+        for stripe in self._stripes:
+            stripe.cache_clear()
+
+
+def striped_lru_cache(function: Callable, maxsize: Optional[int], stripes: Optional[int] = None) -> Callable:
+    """function memoized for concurrent callers; a plain lru_cache when one stripe will do"""
+    stripes = DEFAULT_STRIPES if stripes is None else stripes
+    if stripes <= 1:
+        return lru_cache(maxsize=maxsize)(function)
+    return StripedLRUCache(function, maxsize, stripes)
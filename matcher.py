@@ -0,0 +1,197 @@
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+from components import Component
+
+SLOT_ATTRIBUTE = "data-slot"
+
+
+class ClassInterner:
+    """Assigns every registry class token its own bit"""
+
+    def __init__(self):
+        self.bits: Dict[str, int] = {}
+
+    def intern(self, classes: Iterable[str]) -> int:
+        mask = 0
+        for cls in classes:
+            bit = self.bits.get(cls)
+            if bit is None:
+                bit = 1 << len(self.bits)
+                self.bits[cls] = bit
+            mask |= bit
+        return mask
+
+    def mask(self, classes: Iterable[str]) -> int:
+        """Bitmask of the known tokens in classes; unknown tokens can't affect a match"""
+        bits = self.bits
+        mask = 0
+        for cls in classes:
+            bit = bits.get(cls)
+            if bit:
+                mask |= bit
+        return mask
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledComponent:
+    """Immutable, hot-path form of a registry Component.
+
+    Class sets become frozensets and interned bitmasks, data attributes a tuple
+    of (name, expected string) pairs and config flags plain booleans, so matching
+    and rendering never go through the authoring dicts.
+    """
+    key: str
+    name: str
+    tag: str
+    signature_mask: int
+    data_attributes: Tuple[Tuple[str, str], ...]
+    variant_masks: Tuple[Tuple[str, Tuple[Tuple[str, int], ...]], ...]
+    managed_classes: FrozenSet[str]
+    output_blacklist: FrozenSet[str]
+    self_closing: bool
+    ignore_children: bool
+    skip_this_element: bool
+
+    @classmethod
+    def compile(cls, key: str, component: Component, interner: ClassInterner) -> "CompiledComponent":
+        pattern = component.match_pattern
+        config = component.config
+        return cls(
+            key=key,
+            name=component.name,
+            tag=component.tag,
+            signature_mask=interner.intern(pattern['signature_classes']),
+            data_attributes=tuple((attr, str(value)) for attr, value in pattern['data_attributes'].items()),
+            variant_masks=tuple(
+                (var_type, tuple(
+                    (var_name, interner.intern(var_classes))
+                    for var_name, var_classes in variants.items()
+                ))
+                for var_type, variants in pattern['variant_patterns'].items()
+            ),
+            managed_classes=component.managed_classes,
+            output_blacklist=frozenset(config.get('output_blacklist', ())),
+            self_closing=bool(config.get('self_closing')),
+            ignore_children=bool(config.get('ignore_children')),
+            skip_this_element=bool(config.get('skip_this_element')),
+        )
+
+    def match_data(self, el_attrs: Dict[str, Any]) -> bool:
+        """Whether el_attrs has every data attribute; a multi-valued attribute's tuple never equals one"""
+        for attr, value in self.data_attributes:
+            if el_attrs.get(attr) != value:
+                return False
+        return True
+
+    def match_core(self, element_mask: int) -> bool:
+        return self.signature_mask & element_mask == self.signature_mask
+
+    def detect_variants(self, element_mask: int) -> Dict[str, str]:
+        """First matching variant of each type, without default fallback"""
+        detected = {}
+        for var_type, variants in self.variant_masks:
+            for var_name, mask in variants:
+                if mask & element_mask == mask:
+                    detected[var_type] = var_name
+                    break
+        return detected
+
+
+class TagBucket:
+    """Components sharing one tag, keyed by data-slot or signature class"""
+
+    def __init__(self):
+        self.components: Sequence[CompiledComponent] = []
+        self.slotted: Dict[str, Sequence[int]] = {}
+        self.postings: Dict[str, Sequence[int]] = {}
+        self.unconditional: Sequence[int] = []
+
+    def compact(self):
+        """Swap the lists built while indexing for tuples, which are smaller and never change"""
+        self.components = tuple(self.components)
+        self.slotted = {slot: tuple(hits) for slot, hits in self.slotted.items()}
+        self.postings = {cls: tuple(hits) for cls, hits in self.postings.items()}
+        self.unconditional = tuple(self.unconditional)
+
+    def candidates(self, element_classes: Set[str], slot: Optional[str] = None) -> List[CompiledComponent]:
+        positions = list(self.unconditional)
+        if slot is not None:
+            hits = self.slotted.get(slot)
+            if hits:
+                positions.extend(hits)
+        postings = self.postings
+        if len(element_classes) <= len(postings):
+            for cls in element_classes:
+                hits = postings.get(cls)
+                if hits:
+                    positions.extend(hits)
+        else:
+            for cls, hits in postings.items():
+                if cls in element_classes:
+                    positions.extend(hits)
+        positions.sort()
+        return [self.components[pos] for pos in positions]
+
+
+class ComponentIndex:
+    """Inverted index from tag, data-slot and signature class to candidate components.
+
+    Components that require a ``data-slot`` value are reached through a
+    ``(tag, data-slot)`` hash lookup only. Every other component is posted
+    under exactly one of its signature classes, the one shared by the fewest
+    components of the same tag. Since a match needs all signature classes, an
+    element can only match components posted under a class it carries (or
+    components without signature classes). Candidates are returned in registry
+    order so first-match semantics are unchanged.
+
+    Class sets are compiled to bitmasks over a shared ``ClassInterner`` so
+    signature and variant checks are single ``mask & x == mask`` tests.
+    """
+
+    def __init__(self, components: Dict[str, Component]):
+        self.interner = ClassInterner()
+        self.buckets: Dict[str, TagBucket] = {}
+        # Every attribute some component matches on, besides class
+        self.match_attributes: Tuple[str, ...] = tuple(sorted({
+            attr
+            for component in components.values()
+            for attr in component.match_pattern['data_attributes']
+        }))
+
+        by_tag: Dict[str, List[Tuple[str, Component]]] = {}
+        for key, component in components.items():
+            by_tag.setdefault(component.tag, []).append((key, component))
+
+        for tag, tag_components in by_tag.items():
+            frequency: Dict[str, int] = {}
+            for _, component in tag_components:
+                if SLOT_ATTRIBUTE in component.match_pattern['data_attributes']:
+                    continue
+                for cls in component.match_pattern['signature_classes']:
+                    frequency[cls] = frequency.get(cls, 0) + 1
+
+            bucket = TagBucket()
+            for pos, (key, component) in enumerate(tag_components):
+                bucket.components.append(CompiledComponent.compile(key, component, self.interner))
+                slot = component.match_pattern['data_attributes'].get(SLOT_ATTRIBUTE)
+                if slot is not None:
+                    bucket.slotted.setdefault(str(slot), []).append(pos)
+                    continue
+                signature = component.match_pattern['signature_classes']
+                if not signature:
+                    bucket.unconditional.append(pos)
+                    continue
+                posting_class = min(signature, key=lambda cls: (frequency[cls], cls))
+                bucket.postings.setdefault(posting_class, []).append(pos)
+            bucket.compact()
+            self.buckets[tag] = bucket
+
+    def candidates(self, tag_name: str, element_classes: Set[str], slot: Optional[str] = None) -> List[CompiledComponent]:
+        """Components that could match the element, in registry order"""
+        bucket = self.buckets.get(tag_name)
+        if bucket is None:
+            return []
+        return bucket.candidates(element_classes, slot)
+
+    def class_mask(self, element_classes: Iterable[str]) -> int:
+        return self.interner.mask(element_classes)
@@ -0,0 +1,106 @@
+import threading
+from typing import Optional, Tuple, Union
+
+from lru import striped_lru_cache
+
+DEFAULT_CACHE_SIZE = 8192
+TOKEN_CACHE_SIZE = 16384
+
+
+class MergeService:
+    """Memoizing front end for tailwind-merge.
+
+    Merging is a pure function of the class string, and the same strings repeat
+    across elements and pages, so results are kept in a bounded LRU cache.
+
+    Most class lists have nothing to resolve. Each token is mapped once to its
+    conflict key (modifiers plus conflict group, or the token itself when it
+    belongs to no group); when all keys are distinct the merge would only
+    re-join the tokens, so tailwind-merge is not called at all. That check
+    uses TailwindMerge internals (checked against tailwind-merge 0.3.3); if
+    the installed version lacks them, every list goes to merge() instead.
+
+    tailwind_merge itself is only imported by the first merge that needs it.
+    Any number of threads may merge at once: the caches are striped (see
+    lru.py) and each thread gets its own TailwindMerge, so no merger state is
+    shared between them.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self._local = threading.local()
+        # Whether the installed TailwindMerge has the internals the conflict check uses; None until known
+        self._classifies: Optional[bool] = None
+        self._merge = striped_lru_cache(self._merge_uncached, maxsize)
+        self._conflict_key = striped_lru_cache(self._token_conflict_key, TOKEN_CACHE_SIZE)
+
+    @property
+    def merger(self):
+        """This thread's TailwindMerge"""
+        merger = getattr(self._local, "merger", None)
+        if merger is None:
+            from tailwind_merge import TailwindMerge
+            merger = self._local.merger = TailwindMerge()
+        return merger
+
+    def _token_conflict_key(self, token: str) -> Union[str, Tuple[str, str]]:
+        # Same classification tailwind-merge applies in its first pass
+        modifiers, base_class_name = self.merger._extract_modifiers(token)
+        group = self.merger._get_group(base_class_name)
+        if group:
+            return modifiers, group
+        return token
+
+    def classifies_tokens(self) -> bool:
+        """Whether the installed tailwind-merge supports the conflict check"""
+        if self._classifies is None:
+            merger = self.merger
+            try:
+                modifiers, base_class_name = merger._extract_modifiers("hover:px-2")
+                self._classifies = isinstance(modifiers, str) and bool(merger._get_group(base_class_name))
+            except (AttributeError, TypeError, ValueError):
+                self._classifies = False
+        return self._classifies
+
+    def is_conflict_free(self, tokens) -> bool:
+        """True if merging tokens could not drop any of them; False when that can't be checked"""
+        if not self.classifies_tokens():
+            return False
+        conflict_key = self._conflict_key
+        seen = set()
+        for token in tokens:
+            key = conflict_key(token)
+            if key in seen:
+                return False
+            seen.add(key)
+        return True
+
+    def _merge_uncached(self, class_string: str) -> str:
+        tokens = class_string.split()
+        if self.is_conflict_free(tokens):
+            return " ".join(tokens)
+        return self.merger.merge(class_string)
+
+    def merge(self, class_string: str) -> str:
+        return self._merge(class_string)
+
+    def cache_info(self):
+        """Hits, misses, maxsize and current size of the merge cache"""
+        return self._merge.cache_info()
+
+    def cache_clear(self):
+        self._merge.cache_clear()
+        self._conflict_key.cache_clear()
+
+
+_shared_service: Optional[MergeService] = None
+_shared_service_lock = threading.Lock()
+
+
+def get_merge_service() -> MergeService:
+    """Process-wide merge service shared by every Component and converter"""
+    global _shared_service
+    if _shared_service is None:
+        with _shared_service_lock:
+            if _shared_service is None:
+                _shared_service = MergeService()
+    return _shared_service
@@ -0,0 +1,165 @@
+import re
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+DEFAULT_PARSER = "html.parser"
+# Parsed straight into lxml elements; every other name is a BeautifulSoup feature
+LXML_PARSER = "lxml"
+
+# Attributes BeautifulSoup splits into lists, mirroring
+# bs4.builder.HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+CDATA_LIST_ATTRIBUTES: Dict[str, FrozenSet[str]] = {
+    "*": frozenset({"class", "accesskey", "dropzone"}),
+    "a": frozenset({"rel", "rev"}),
+    "link": frozenset({"rel", "rev"}),
+    "td": frozenset({"headers"}),
+    "th": frozenset({"headers"}),
+    "form": frozenset({"accept-charset"}),
+    "object": frozenset({"archive"}),
+    "area": frozenset({"rel"}),
+    "icon": frozenset({"sizes"}),
+    "iframe": frozenset({"sandbox"}),
+    "output": frozenset({"for"}),
+}
+
+_DOCTYPE_RE = re.compile(r"\s*<!doctype", re.IGNORECASE)
+# libxml2 fills these in as name="name" where they are written without a value
+LXML_BOOLEAN_ATTRIBUTES = frozenset({"checked", "compact", "declare", "defer", "disabled", "ismap", "multiple",
+                                     "nohref", "noresize", "noshade", "nowrap", "readonly", "selected"})
+
+# A document's first tag, after at most whitespace, comments and a doctype, is <html>, <head> or <body>
+_DOCUMENT_RE = re.compile(r"(?:\s+|<!--.*?-->|<!doctype[^>]*>)*<(html|head|body)[\s>]", re.IGNORECASE | re.DOTALL)
+_BODY_RE = re.compile(r"<body[\s>]", re.IGNORECASE)
+
+# Stands in for BeautifulSoup's Doctype node in lxml node lists
+DOCTYPE = object()
+
+_list_attributes_by_tag: Dict[str, FrozenSet[str]] = {}
+# One lxml parser per thread: each keeps the error log of its last parse
+_lxml_parsers = threading.local()
+
+
+def list_attributes(tag: str) -> FrozenSet[str]:
+    attrs = _list_attributes_by_tag.get(tag)
+    if attrs is None:
+        attrs = CDATA_LIST_ATTRIBUTES["*"] | CDATA_LIST_ATTRIBUTES.get(tag, frozenset())
+        _list_attributes_by_tag[tag] = attrs
+    return attrs
+
+
+def _lxml_parser():
+    parser = getattr(_lxml_parsers, "parser", None)
+    if parser is None:
+        import lxml.html
+        # Without huge_tree libxml2 stops nesting at 256 levels, which iterative mode is meant to handle
+        parser = _lxml_parsers.parser = lxml.html.HTMLParser(huge_tree=True)
+    return parser
+
+
+def _check_lxml_limits(parser):
+    """Raise if libxml2 dropped part of the input on hitting one of its limits"""
+    for entry in parser.error_log:
+        if entry.type_name == "ERR_RESOURCE_LIMIT":
+            # libxml2 suggests XML_PARSE_HUGE, which huge_tree already sets
+            reason = entry.message.split(",")[0].strip()
+            raise ValueError(f"lxml could not parse the whole document ({reason}); "
+                             f"use parser={DEFAULT_PARSER!r} for it")
+
+
+def parse_lxml(html: str) -> List[Any]:
+    """Top-level nodes of html: DOCTYPE, text strings and lxml elements.
+
+    Fragments keep their own top level, as with BeautifulSoup's html.parser;
+    lxml only gets to wrap the input in html/body when it is a full document.
+    Input that starts at <head> or <body> keeps those elements, without the
+    <html> lxml adds around them or a <body> it implies. Raises ValueError rather than return a truncated tree when the input
+    exceeds libxml2's limits, such as nesting over 2048 levels deep.
+    """
+    import lxml.html
+
+    parser = _lxml_parser()
+    nodes: List[Any] = []
+    if _DOCTYPE_RE.match(html):
+        nodes.append(DOCTYPE)
+
+    document = _DOCUMENT_RE.match(html)
+    if document:
+        root = lxml.html.document_fromstring(html, parser=parser)
+        _check_lxml_limits(parser)
+        # Comments outside <html> are its siblings
+        nodes.extend(reversed(list(root.itersiblings(preceding=True))))
+        if document.group(1).lower() == "html":
+            nodes.append(root)
+            if root.tail:
+                nodes.append(root.tail)
+        else:
+            implied_body = not _BODY_RE.search(html)
+            for node in lxml_contents(root):
+                if implied_body and getattr(node, "tag", None) == "body":
+                    nodes.extend(lxml_contents(node))
+                    if node.tail:
+                        nodes.append(node.tail)
+                else:
+                    nodes.append(node)
+        nodes.extend(root.itersiblings())
+        return nodes
+
+    if not html.strip():
+        return nodes
+
+    fragments = lxml.html.fragments_fromstring(html, parser=parser)
+    _check_lxml_limits(parser)
+    for node in fragments:
+        nodes.append(node)
+        if not isinstance(node, str) and node.tail:
+            nodes.append(node.tail)
+    return nodes
+
+
+def lxml_attributes(el) -> Dict[str, Any]:
+    """Attributes of an lxml element in BeautifulSoup's shape.
+
+    Valueless boolean attributes read as "" again. Two cases stay apart from
+    html.parser: an explicit disabled="disabled" also reads as "", and of an
+    attribute written twice lxml keeps the first value, not the last.
+    """
+    attrs = dict(el.attrib)
+    if not LXML_BOOLEAN_ATTRIBUTES.isdisjoint(attrs):
+        for attr in LXML_BOOLEAN_ATTRIBUTES.intersection(attrs):
+            if attrs[attr] == attr:
+                attrs[attr] = ""
+    for attr in list_attributes(el.tag):
+        value = attrs.get(attr)
+        if value is not None:
+            attrs[attr] = value.split()
+    return attrs
+
+
+def lxml_contents(el) -> List[Any]:
+    """Child elements and text of an lxml element in document order"""
+    contents = []
+    if el.text:
+        contents.append(el.text)
+    for child in el:
+        contents.append(child)
+        if child.tail:
+            contents.append(child.tail)
+    return contents
+
+
+def lxml_markup(el) -> str:
+    """el and everything inside it serialized, without the text following it"""
+    from lxml import etree
+    return etree.tostring(el, encoding=str, with_tail=False)
+
+
+def event_attributes(tag: str, attrs: List[Tuple[str, Optional[str]]]) -> Dict[str, Any]:
+    """html.parser start tag attributes as BeautifulSoup would store them"""
+    el_attrs = {}
+    for attr, value in attrs:
+        el_attrs[attr] = "" if value is None else value
+    for attr in list_attributes(tag):
+        value = el_attrs.get(attr)
+        if value is not None:
+            el_attrs[attr] = value.split()
+    return el_attrs
@@ -0,0 +1,37 @@
+from typing import Dict, Optional
+
+from components import Component
+from matcher import SLOT_ATTRIBUTE
+
+PROFILE_ALL = "all"
+PROFILE_V4 = "v4"
+PROFILE_LEGACY = "legacy"
+PROFILES = (PROFILE_ALL, PROFILE_V4, PROFILE_LEGACY)
+
+LEGACY_SUFFIX = "Legacy"
+
+def component_generation(key: str, component: Component) -> Optional[str]:
+    """PROFILE_V4 or PROFILE_LEGACY for generation-specific entries, None for shared ones.
+
+    Registry keys ending in ``Legacy`` are the pre-v4 markup. Other entries
+    identified by a ``data-slot`` are v4. Everything else (plain Button,
+    Card, LucideIcon, ...) is shared by both generations.
+    """
+    if key.endswith(LEGACY_SUFFIX):
+        return PROFILE_LEGACY
+    if SLOT_ATTRIBUTE in component.match_pattern['data_attributes']:
+        return PROFILE_V4
+    return None
+
+
+def select_components(components: Dict[str, Component], profile: str) -> Dict[str, Component]:
+    """The registry entries a profile matches against, in registry order"""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown registry profile {profile!r}, expected one of {', '.join(PROFILES)}")
+    if profile == PROFILE_ALL:
+        return components
+    return {
+        key: component
+        for key, component in components.items()
+        if component_generation(key, component) in (None, profile)
+    }
@@ -1,6 +1,4 @@
 from components import Component
-from typing import Dict, Tuple, Optional
-from tailwind_merge import TailwindMerge
 
 COMPONENTS = {
         "Button": Component(
@@ -0,0 +1,308 @@
+"""HTTP conversion service on asyncio, converting in a pool of worker processes.
+
+    python service.py --port 8000 --workers 4
+    python service.py --unix /tmp/jsx.sock
+    curl --data-binary @page.html 'http://127.0.0.1:8000/convert?timeout=5'
+
+POST /convert takes HTML and answers with the JSX. GET /health answers with
+the pool's counters as JSON. The event loop only parses requests and writes
+responses; conversions run in worker processes forked, warm, when the service
+starts. At most one conversion per worker is submitted at a time and at most
+max_queue more wait for one; beyond that requests are turned away with 503
+at once. A request waits at most its deadline (?timeout=SECONDS, capped by
+--timeout), and one whose client disconnects is dropped. Either way a
+conversion not yet started never runs. One already running finishes in its
+worker, which is not free again until then, and its result is discarded.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import sys
+import time
+from concurrent.futures import Executor, Future
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from batch import available_cpus, convert_in_worker, worker_pool
+from converter import JSXConverter
+from parsers import DEFAULT_PARSER
+from profiles import PROFILE_ALL, PROFILES
+
+DEFAULT_QUEUE = 64
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_BODY = 64 * 1024 * 1024
+MAX_HEADER_BYTES = 64 * 1024
+# Converted by every worker before the service accepts connections
+WARM_UP = '<div class="flex"><p>Ready</p></div>'
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           422: "Unprocessable Entity", 499: "Client Closed Request", 500: "Internal Server Error",
+           503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class Overloaded(Exception):
+    """Every worker is busy and the queue is full"""
+
+
+class ConversionFailed(Exception):
+    """The converter raised on the document"""
+
+
+class BadRequest(Exception):
+    """The request isn't HTTP this service understands"""
+
+
+@dataclass
+class ServiceStats:
+    running: int = 0
+    queued: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+
+
+class ConversionService:
+    """Bounded, deadline-aware front end to a process pool of converters"""
+
+    def __init__(self, executor: Executor, workers: int, max_queue: int = DEFAULT_QUEUE,
+                 timeout: float = DEFAULT_TIMEOUT, max_body: int = DEFAULT_MAX_BODY):
+        self.executor = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_body = max_body
+        self.stats = ServiceStats()
+        # One per worker, held from submission until the worker is done with it
+        self._slots = asyncio.Semaphore(workers)
+
+    async def convert(self, html: str, timeout: Optional[float] = None) -> str:
+        """JSX for html from a worker.
+
+        Raises Overloaded when the queue is full, asyncio.TimeoutError when the
+        deadline passes first and ConversionFailed when the converter raises.
+        Cancelling the call withdraws the conversion if no worker has started it.
+        A timeout that is negative or not finite raises ValueError; nan would
+        otherwise slip past min() and lift the service's cap.
+        """
+        if timeout is not None and not (math.isfinite(timeout) and timeout >= 0):
+            raise ValueError(f"timeout must be a non-negative number of seconds, not {timeout!r}")
+        stats = self.stats
+        if stats.queued + stats.running >= self.workers + self.max_queue:
+            stats.rejected += 1
+            raise Overloaded()
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        deadline = time.monotonic() + timeout
+
+        stats.queued += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            stats.timed_out += 1
+            raise
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        finally:
+            stats.queued -= 1
+
+        stats.running += 1
+        future = self.executor.submit(convert_in_worker, html)
+        # The worker stays busy until the conversion ends, whatever happens to this request
+        future.add_done_callback(self._release_slot(asyncio.get_running_loop()))
+        try:
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                            max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            future.cancel()
+            stats.timed_out += 1
+            raise
+        except asyncio.CancelledError:
+            future.cancel()
+            stats.cancelled += 1
+            raise
+        if not result.ok:
+            stats.failed += 1
+            raise ConversionFailed(result.error)
+        stats.completed += 1
+        return result.jsx
+
+    def _release_slot(self, loop: asyncio.AbstractEventLoop):
+        def release(_: Future):
+            loop.call_soon_threadsafe(self._finished)
+        return release
+
+    def _finished(self):
+        self.stats.running -= 1
+        self._slots.release()
+
+    def health(self) -> dict:
+        return {"workers": self.workers, "max_queue": self.max_queue, **asdict(self.stats)}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one request on a connection, then close it"""
+        try:
+            status, body, headers = await self._respond(reader)
+        except (BadRequest, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            status, body, headers = 400, "Malformed request\n", {}
+        except asyncio.CancelledError:
+            # The server is shutting down; asyncio would log a handler that ends cancelled
+            status = 499
+        if status == 499:
+            writer.close()
+            return
+        data = body.encode("utf-8", "surrogatepass")
+        headers.setdefault("Content-Type", "text/plain; charset=utf-8")
+        head = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Length: {len(data)}", "Connection: close"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        try:
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader: asyncio.StreamReader) -> Tuple[int, str, Dict[str, str]]:
+        method, target, request_headers = await read_request_head(reader)
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                return 405, "Use GET\n", {"Allow": "GET"}
+            return 200, json.dumps(self.health()) + "\n", {"Content-Type": "application/json"}
+        if url.path != "/convert":
+            return 404, "Not found\n", {}
+        if method != "POST":
+            return 405, "Use POST\n", {"Allow": "POST"}
+
+        length = request_headers.get("content-length", "")
+        if not (length.isascii() and length.isdigit()):
+            return 400, "Content-Length required\n", {}
+        if int(length) > self.max_body:
+            return 413, f"Body over {self.max_body} bytes\n", {}
+        try:
+            html = (await reader.readexactly(int(length))).decode("utf-8")
+        except UnicodeDecodeError as e:
+            return 400, f"Body is not UTF-8: {e}\n", {}
+        timeout = None
+        query = parse_qs(url.query)
+        if "timeout" in query:
+            try:
+                timeout = float(query["timeout"][-1])
+            except ValueError:
+                timeout = math.nan
+            if not math.isfinite(timeout) or timeout < 0:
+                return 400, "timeout must be a non-negative number of seconds\n", {}
+
+        conversion = asyncio.ensure_future(self.convert(html, timeout))
+        # Nothing more is expected on the connection, so a read returning nothing means the client went away
+        hangup = asyncio.ensure_future(reader.read(1))
+        while not conversion.done():
+            await asyncio.wait([conversion, hangup], return_when=asyncio.FIRST_COMPLETED)
+            if hangup.done() and not conversion.done():
+                if not hangup.exception() and hangup.result():
+                    hangup = asyncio.ensure_future(reader.read(1))
+                    continue
+                conversion.cancel()
+                await asyncio.gather(conversion, return_exceptions=True)
+                return 499, "", {}
+        hangup.cancel()
+        try:
+            return 200, conversion.result(), {}
+        except Overloaded:
+            return 503, "All workers busy and queue full\n", {"Retry-After": "1"}
+        except asyncio.TimeoutError:
+            return 504, "Deadline passed before the conversion finished\n", {}
+        except ConversionFailed as e:
+            return 422, f"{e}\n", {}
+        except Exception as e:
+            return 500, f"{type(e).__name__}: {e}\n", {}
+
+
+async def read_request_head(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str]]:
+    """Method, target and lower-cased headers of an HTTP/1.x request"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        raise BadRequest(lines[0])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], headers
+
+
+async def start_service(service: ConversionService, host: str = "127.0.0.1", port: int = 8000,
+                        unix: Optional[str] = None) -> asyncio.AbstractServer:
+    """Listen on host:port, or on the Unix socket path unix"""
+    if unix:
+        return await asyncio.start_unix_server(service.handle, unix, limit=MAX_HEADER_BYTES)
+    return await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER_BYTES)
+
+
+def open_pool(stack: ExitStack, converter: JSXConverter, workers: int) -> Executor:
+    """A process pool of converters, each having converted WARM_UP"""
+    executor = stack.enter_context(worker_pool(converter, workers, warm_documents=(WARM_UP,)))
+    for future in [executor.submit(convert_in_worker, WARM_UP) for _ in range(workers)]:
+        future.result()
+    return executor
+
+
+async def serve(converter: JSXConverter, workers: int, host: str, port: int, unix: Optional[str],
+                max_queue: int, timeout: float, max_body: int):
+    with ExitStack() as stack:
+        service = ConversionService(open_pool(stack, converter, workers), workers, max_queue, timeout, max_body)
+        server = await start_service(service, host, port, unix)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        addresses: List[str] = [str(sock.getsockname()) for sock in server.sockets]
+        print(f"converting with {workers} workers on {', '.join(addresses)}", file=sys.stderr)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if unix:
+                os.unlink(unix)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="worker processes; 0 uses every CPU")
+    parser.add_argument("--queue", type=int, default=DEFAULT_QUEUE, help="requests that may wait for a worker")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="longest deadline, in seconds")
+    parser.add_argument("--max-body-mib", type=int, default=DEFAULT_MAX_BODY // (1024 * 1024))
+    parser.add_argument("--parser", default=DEFAULT_PARSER, help="'lxml' or a BeautifulSoup parser name")
+    parser.add_argument("--profile", default=PROFILE_ALL, choices=PROFILES)
+    parser.add_argument("--catalog", help="load components from this catalog directory instead of registry.py")
+    parser.add_argument("--memoize", action="store_true", help="render repeated subtrees once; pays off with --parser lxml only")
+    args = parser.parse_args(argv)
+
+    options = {"parser": args.parser, "profile": args.profile, "memoize": args.memoize}
+    if args.catalog:
+        converter = JSXConverter.from_catalog(args.catalog, **options)
+    else:
+        converter = JSXConverter(**options)
+    workers = args.workers or available_cpus()
+    asyncio.run(serve(converter, workers, args.host, args.port, args.unix, args.queue, args.timeout,
+                      args.max_body_mib * 1024 * 1024))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
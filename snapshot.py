@@ -0,0 +1,97 @@
+import os
+import pickle
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+from components import Component
+from matcher import ComponentIndex
+
+# Bump when the snapshot layout or the pickled classes change shape
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAGIC = "shadcn-parser-registry"
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Sources whose content determines the prepared registry
+SOURCE_FILES = ("registry.py", "components.py", "matcher.py", "analyzer.py")
+
+Registry = Tuple[Dict[str, Component], ComponentIndex]
+
+
+def files_fingerprint(paths: Iterable[str], directory: str = PACKAGE_DIR) -> str:
+    """Checksum of the named files' contents"""
+    # zlib rather than hashlib: importing OpenSSL would cost more than the load saves
+    parts = []
+    for name in paths:
+        with open(os.path.join(directory, name), "rb") as f:
+            source = f.read()
+        parts.append(f"{name}:{len(source)}:{zlib.crc32(source):08x}")
+    return ";".join(parts)
+
+
+def registry_fingerprint() -> str:
+    """Checksum of the registry definition and the code that prepares it"""
+    return files_fingerprint(SOURCE_FILES)
+
+
+def default_snapshot_path() -> str:
+    return os.path.join(PACKAGE_DIR, "__pycache__", f"registry.v{SNAPSHOT_VERSION}.snapshot")
+
+
+def compile_registry(path: Optional[str] = None) -> Registry:
+    """Import registry.py, index the entries that can match and write both to a snapshot"""
+    from analyzer import dispatch_table
+    from registry import COMPONENTS
+
+    components = COMPONENTS
+    index = ComponentIndex(dispatch_table(components))
+    write_snapshot((components, index), path or default_snapshot_path())
+    return components, index
+
+
+def write_snapshot(prepared: Registry, path: str) -> bool:
+    """Atomically write the snapshot; False if the location isn't writable"""
+    import tempfile
+
+    header = {"magic": SNAPSHOT_MAGIC, "version": SNAPSHOT_VERSION, "fingerprint": registry_fingerprint()}
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".registry-", suffix=".tmp")
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(prepared, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return False
+    return True
+
+
+def read_snapshot(path: str) -> Optional[Registry]:
+    """The prepared registry, or None if the snapshot is missing or stale"""
+    try:
+        with open(path, "rb") as f:
+            header = pickle.load(f)
+            if header != {"magic": SNAPSHOT_MAGIC, "version": SNAPSHOT_VERSION, "fingerprint": registry_fingerprint()}:
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def load_registry(path: Optional[str] = None) -> Registry:
+    """Registry components and their index, from the snapshot when it is current"""
+    path = path or default_snapshot_path()
+    prepared = read_snapshot(path)
+    if prepared is None:
+        prepared = compile_registry(path)
+    return prepared
+
+
+if __name__ == "__main__":
+    components, _ = compile_registry()
+    print(f"Compiled {len(components)} components to {default_snapshot_path()}")
@@ -0,0 +1,148 @@
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Tuple, TextIO
+
+from converter import JSXConverter
+from parsers import event_attributes
+from writer import JSXWriter
+
+# Tags BeautifulSoup's html.parser builder closes as soon as they open
+EMPTY_ELEMENT_TAGS = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed",
+    "frame", "hr", "image", "img", "input", "isindex", "keygen", "link",
+    "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+})
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StreamingJSXConverter(HTMLParser):
+    """Converts HTML to JSX from parser events, without building a DOM.
+
+    Components are matched from the start tag alone, so JSX is written while
+    input is still being fed and memory grows with nesting depth rather than
+    document size. Nesting follows BeautifulSoup's html.parser builder: empty
+    elements close immediately, an end tag closes everything up to the nearest
+    open element of that name, and unmatched end tags are ignored. Character
+    references are decoded by html.parser itself, so unknown entities such as
+    ``&foo;`` keep their semicolon where BeautifulSoup drops it.
+    """
+
+    def __init__(self, converter: JSXConverter, stream: TextIO):
+        super().__init__(convert_charrefs=True)
+        self.converter = converter.prepare()
+        self.writer = JSXWriter(stream)
+        # Open elements: [tag name, close writer frame, child indent, ignored]
+        self._open: List[list] = []
+        self._text: List[str] = []
+        # Empty elements per tag name still expecting a redundant explicit end tag
+        self._already_closed: Counter = Counter()
+
+    def _indent_level(self) -> int:
+        return self._open[-1][2] if self._open else 0
+
+    def _ignoring(self) -> bool:
+        return bool(self._open) and self._open[-1][3]
+
+    def _write_text(self, text: str):
+        if self._ignoring():
+            return
+        text = self.converter._format_text(text.strip(), self.writer.indent(self._indent_level()))
+        if text:
+            self.writer.item(text)
+
+    def _flush_text(self):
+        if self._text:
+            text = "".join(self._text)
+            self._text.clear()
+            self._write_text(text)
+
+    def _start(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self._flush_text()
+        if self._ignoring():
+            self._open.append([tag, False, 0, True])
+            return
+
+        el_attrs = event_attributes(tag, attrs)
+        walk = self.converter._start_tag(tag, el_attrs, None, self.writer, self._indent_level())
+        if walk is None:
+            # Self-closing or ignore_children component: drop everything inside
+            self._open.append([tag, False, 0, True])
+        else:
+            _, child_indent, close = walk
+            self._open.append([tag, close, child_indent, False])
+
+    def _pop_to(self, tag: str):
+        for depth in range(len(self._open) - 1, -1, -1):
+            if self._open[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self._open) > depth:
+            _, close, _, _ = self._open.pop()
+            if close:
+                self.writer.close()
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs)
+        if tag in EMPTY_ELEMENT_TAGS:
+            self._pop_to(tag)
+            # A later explicit </tag> for it is redundant
+            self._already_closed[tag] += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs)
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag):
+        if self._already_closed[tag]:
+            self._already_closed[tag] -= 1
+            return
+        self._flush_text()
+        self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def handle_comment(self, data):
+        self._flush_text()
+        self._write_text(data)
+
+    def handle_decl(self, decl):
+        self._flush_text()
+        if not self._ignoring():
+            self.writer.item("<!DOCTYPE html>")
+
+    def unknown_decl(self, data):
+        self._flush_text()
+        if data.upper().startswith("CDATA["):
+            data = data[len("CDATA["):]
+        self._write_text(data)
+
+    def handle_pi(self, data):
+        self._flush_text()
+        self._write_text(data)
+
+    def close(self):
+        super().close()
+        self._flush_text()
+        while self._open:
+            _, close, _, _ = self._open.pop()
+            if close:
+                self.writer.close()
+
+
+def convert_stream(converter: JSXConverter, chunks: Iterable[str], stream: TextIO) -> None:
+    """Convert HTML arriving in chunks, writing JSX to stream as it goes
+
+    A catalog converter loads every family, since later chunks may need any
+    of them.
+    """
+    parser = StreamingJSXConverter(converter, stream)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+
+
+def convert_file(converter: JSXConverter, source: TextIO, stream: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+    convert_stream(converter, iter(lambda: source.read(chunk_size), ""), stream)
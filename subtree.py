@@ -0,0 +1,94 @@
+"""Rendered JSX of recurring subtrees, reused instead of matched and written again.
+
+Each element gets a key standing for its whole subtree: equal keys mean equal
+tag, attributes and (recursively) children, hence equal JSX up to
+indentation. lxml elements are keyed by a digest of their serialized markup;
+BeautifulSoup trees, which have no fast serializer, get structural ids
+assigned bottom-up. That pass visits every node before any is rendered and
+costs about as much as rendering them all, so it's lxml trees that gain.
+The second time a key turns up its subtree is rendered once with MARKER in
+place of its indentation, and from then on each occurrence writes that
+template with MARKER replaced by the indentation where it lands, without
+visiting the subtree at all.
+"""
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+# Stands in for the indentation of a template's root; subtrees containing it are never memoized
+MARKER = "\x00"
+# Key of a doctype among its siblings' keys; text is keyed by its stripped self
+DOCTYPE_KEY = ()
+
+# Bytes of the blake2b digest keying an lxml subtree
+SUBTREE_DIGEST_SIZE = 16
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MAX_CHARS = 64 * 1024 * 1024
+
+
+def markup_digest(markup: str) -> bytes:
+    """Key of an lxml subtree from its serialized markup"""
+    # hashlib loads OpenSSL, which only lxml memoizing needs, so not on import
+    from hashlib import blake2b
+    return blake2b(markup.encode(), digest_size=SUBTREE_DIGEST_SIZE).digest()
+
+
+def attributes_key(attrs: dict) -> Optional[Tuple]:
+    """Hashable form of an element's attributes, or None when one contains MARKER"""
+    items = []
+    for attr, value in attrs.items():
+        if isinstance(value, list):
+            value = tuple(value)
+            if any(MARKER in part for part in value):
+                return None
+        elif MARKER in value:
+            return None
+        items.append((attr, value))
+    return tuple(items)
+
+
+class SubtreeMemo:
+    """Subtree keys seen so far and the templates rendered for them, kept across documents.
+
+    Once more than max_entries keys are held or templates add up to more than
+    max_chars characters, nothing new is recorded, and everything is dropped
+    together at the start of the next document.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_chars: int = DEFAULT_MAX_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        # Structural ids of BeautifulSoup subtrees
+        self.ids: Dict[Hashable, int] = {}
+        self.seen: Set[Hashable] = set()
+        self.templates: Dict[Hashable, str] = {}
+        self.chars = 0
+
+    def full(self) -> bool:
+        return len(self.ids) + len(self.seen) > self.max_entries or self.chars > self.max_chars
+
+    def begin_document(self):
+        if self.full():
+            self.ids.clear()
+            self.seen.clear()
+            self.templates.clear()
+            self.chars = 0
+
+    def intern(self, structure: Hashable) -> int:
+        """Structural id of the subtree (tag, attributes key, child keys)"""
+        sid = self.ids.get(structure)
+        if sid is None:
+            sid = self.ids[structure] = len(self.ids)
+        return sid
+
+    def recurs(self, key: Hashable) -> bool:
+        """Record an occurrence of key; whether there was one before"""
+        if key in self.seen:
+            return True
+        if not self.full():
+            self.seen.add(key)
+        return False
+
+    def store(self, key: Hashable, template: str):
+        if not self.full():
+            self.templates[key] = template
+            self.chars += len(template)
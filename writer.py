@@ -0,0 +1,56 @@
+from typing import List, TextIO
+
+
+class JSXWriter:
+    """Writes rendered JSX fragments straight to a text stream.
+
+    Siblings are separated by newlines exactly as ``"\\n".join`` would, so
+    nothing is ever re-copied into a parent string. An element's opening tag is
+    held back until its first child is written, because an element without
+    rendered children is written in its empty form instead.
+    """
+
+    def __init__(self, stream: TextIO, base: str = ""):
+        self.write = stream.write
+        # Written before every indentation; a placeholder when rendering reusable templates
+        self.base = base
+        # Frames are [pending header or None, separator before next item, ...]
+        self._stack: List[list] = [[None, ""]]
+
+    def _start_item(self):
+        stack = self._stack
+        depth = len(stack) - 1
+        while stack[depth][0] is not None:
+            depth -= 1
+
+        write = self.write
+        frame = stack[depth]
+        write(frame[1])
+        frame[1] = "\n"
+        for depth in range(depth + 1, len(stack)):
+            frame = stack[depth]
+            write(frame[0])
+            write(">\n")
+            frame[0] = None
+
+    def indent(self, level: int) -> str:
+        return self.base + "  " * level
+
+    def item(self, text: str):
+        """Write one complete sibling, e.g. a text line or a self-closing tag"""
+        self._start_item()
+        self.write(text)
+
+    def open(self, header: str, closing: str, self_closing: bool):
+        """Start an element whose opening tag is header without the final '>'"""
+        self._stack.append([header, "\n", closing, self_closing])
+
+    def close(self):
+        header, _, closing, self_closing = self._stack.pop()
+        if header is None:
+            self.write("\n")
+            self.write(closing)
+        elif self_closing:
+            self.item(f"{header} />")
+        else:
+            self.item(f"{header}>\n\n{closing}")